@@ -87,3 +87,11 @@ def track_alternatives(library):
 track_alternatives.params = ["rich", "progressbar2", "alive-progress", "tqdm"]
 track_alternatives.param_names = ["library"]
 track_alternatives.unit = "Seconds (lower is better)"
+
+
+def timeraw_import(module):
+    return f"import {module}"
+
+
+timeraw_import.params = ["tqdm", "tqdm.auto"]
+timeraw_import.param_names = ["module"]
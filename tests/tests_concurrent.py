@@ -3,7 +3,9 @@ Tests for `tqdm.contrib.concurrent`.
 """
 from pytest import warns
 
-from tqdm.contrib.concurrent import process_map, thread_map
+from tqdm.auto import tqdm as tqdm_auto
+from tqdm.contrib.concurrent import (
+    process_imap, process_map, thread_imap, thread_map, update_progress)
 
 from .tests_tqdm import StringIO, TqdmWarning, closing, importorskip, mark, skip
 
@@ -13,6 +15,13 @@ def incr(x):
     return x + 1
 
 
+def incr_progress(x):
+    """Dummy function reporting intra-task progress"""
+    for _ in range(10):
+        update_progress()
+    return x + 1
+
+
 def test_thread_map():
     """Test contrib.concurrent.thread_map"""
     with closing(StringIO()) as our_file:
@@ -36,6 +45,96 @@ def test_process_map():
             skip(str(err))
 
 
+def test_process_map_shared_progress():
+    """Test contrib.concurrent.process_map(shared_progress=True)"""
+    with closing(StringIO()) as our_file:
+        a = range(9)
+        b = [i + 1 for i in a]
+        try:
+            assert process_map(incr_progress, a, total=90, max_workers=2, file=our_file,
+                               shared_progress=True) == b
+        except ImportError as err:
+            skip(str(err))
+        assert "90/90" in our_file.getvalue()
+    with closing(StringIO()) as our_file:
+        assert process_map(incr_progress, a, total=90, max_workers=2, file=our_file,
+                           shared_progress=True, chunksize="auto") == b
+        assert "90/90" in our_file.getvalue()
+    update_progress()  # no-op outside workers
+
+
+def test_thread_map_shared_progress():
+    """Test contrib.concurrent.thread_map(shared_progress=True)"""
+    with closing(StringIO()) as our_file:
+        a = range(9)
+        b = [i + 1 for i in a]
+        try:
+            assert thread_map(incr_progress, a, total=90, max_workers=3, file=our_file,
+                              shared_progress=True) == b
+        except ImportError as err:
+            skip(str(err))
+        assert "90/90" in our_file.getvalue()
+    with closing(StringIO()) as our_file:
+        assert thread_map(incr_progress, a, total=100, initial=10, max_workers=3,
+                          file=our_file, shared_progress=True) == b
+        assert "100/100" in our_file.getvalue()
+    update_progress()  # no-op outside workers (incl. the calling thread)
+
+
+def test_thread_imap():
+    """Test contrib.concurrent.thread_imap"""
+    with closing(StringIO()) as our_file:
+        consumed = []
+
+        def items():
+            for i in range(100):
+                consumed.append(i)
+                yield i
+
+        res = thread_imap(incr, items(), max_workers=2, window=3, chunksize=2, file=our_file)
+        assert next(res) == 1
+        assert len(consumed) <= 3 * 2 + 2  # bounded read-ahead
+        assert list(res) == list(range(2, 101))
+        assert "100it" in our_file.getvalue()
+
+        res = thread_imap(incr, range(9), ordered=False, total=9, file=our_file)
+        assert sorted(res) == list(range(1, 10))
+        assert "9/9" in our_file.getvalue()
+
+        lock = tqdm_auto.get_lock()
+        res = thread_imap(incr, range(9), file=our_file, lock_name="th_lock")
+        assert next(res) == 1
+        assert tqdm_auto.get_lock() is not lock
+        res.close()  # early exit
+        assert tqdm_auto.get_lock() is lock
+
+
+def test_process_imap():
+    """Test contrib.concurrent.process_imap"""
+    with closing(StringIO()) as our_file:
+        a = range(9)
+        b = [i + 1 for i in a]
+        try:
+            assert list(process_imap(incr, a, max_workers=2, chunksize=2,
+                                     file=our_file)) == b
+        except ImportError as err:
+            skip(str(err))
+        assert sorted(process_imap(incr, a, ordered=False, file=our_file)) == b
+
+
+def test_chunksize_auto():
+    """Test contrib.concurrent adaptive `chunksize`"""
+    with closing(StringIO()) as our_file:
+        a = range(1000)
+        b = [i + 1 for i in a]
+        assert thread_map(incr, a, chunksize="auto", file=our_file) == b
+        assert "1000/1000" in our_file.getvalue()
+        try:
+            assert process_map(incr, a, chunksize="auto", max_workers=2, file=our_file) == b
+        except ImportError as err:
+            skip(str(err))
+
+
 @mark.parametrize("iterables,should_warn", [([], False), (['x'], False), ([()], False),
                                             (['x', ()], False), (['x' * 1001], True),
                                             (['x' * 100, ('x',) * 1001], True)])
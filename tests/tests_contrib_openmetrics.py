@@ -0,0 +1,56 @@
+"""Test `tqdm.contrib.openmetrics`."""
+from urllib.request import urlopen
+
+from tqdm import tqdm
+from tqdm.contrib.openmetrics import (
+    CONTENT_TYPE, generate_latest, snapshot, start_http_server, write_textfile)
+
+from .tests_tqdm import StringIO, closing
+
+
+def test_generate_latest():
+    """Test OpenMetrics exposition of live bars"""
+    with closing(StringIO()) as our_file:
+        with tqdm(total=10, file=our_file, desc='a "quoted"\ndesc', initial=4) as t:
+            with tqdm(file=our_file, unit="B", disable=True):
+                (labels, values), = snapshot()
+            assert labels == {'desc': 'a "quoted"\ndesc', 'unit': "it", 'position': 0}
+            assert values['tqdm_n'] == 4
+            assert values['tqdm_total'] == 10
+            t.update(2)
+            text = generate_latest()
+        lbl = r'{desc="a \"quoted\"\ndesc",unit="it",position="0"}'
+        assert f"\ntqdm_n_total{lbl} 6.0\n" in text
+        assert f"\ntqdm_total{lbl} 10.0\n" in text
+        assert "# TYPE tqdm_n counter\n" in text
+        assert "# UNIT tqdm_elapsed_seconds seconds\n" in text
+        assert text.endswith("# EOF\n")
+    # closed bars are not exported
+    assert generate_latest().count("{") == 0
+
+
+def test_write_textfile(tmp_path):
+    """Test textfile collector output"""
+    path = tmp_path / "tqdm.prom"
+    with closing(StringIO()) as our_file:
+        with tqdm(total=10, file=our_file, desc="tf"):
+            write_textfile(str(path))
+    assert 'tqdm_total{desc="tf",unit="it",position="0"} 10.0' in path.read_text()
+    assert [i.name for i in tmp_path.iterdir()] == ["tqdm.prom"]
+
+
+def test_http_server():
+    """Test scraping over HTTP"""
+    server = start_http_server()
+    try:
+        port = server.server_address[1]
+        with closing(StringIO()) as our_file:
+            with tqdm(total=10, file=our_file, desc="http") as t:
+                t.update(3)
+                with urlopen(f"http://127.0.0.1:{port}/metrics") as res:
+                    assert res.headers["Content-Type"] == CONTENT_TYPE
+                    text = res.read().decode("utf-8")
+        assert 'tqdm_n_total{desc="http",unit="it",position="0"} 3.0' in text
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,85 @@
+"""Test `tqdm.contrib.trace`."""
+from json import loads
+
+from tqdm.contrib.trace import (
+    CLOSE, DESC, MAGIC, RECORD, RESET, SAMPLE, START, BinaryRecorder, ChromeTraceRecorder,
+    read_log, tqdm_trace, ttrange)
+
+from .tests_tqdm import BytesIO, StringIO, closing, raises
+
+
+def test_chrome_trace():
+    """Test Chrome trace events of nested bars"""
+    with closing(StringIO()) as our_file, closing(StringIO()) as trace:
+        with ChromeTraceRecorder(trace) as recorder:
+            for _ in ttrange(2, file=our_file, desc="outer", recorder=recorder):
+                with tqdm_trace(total=3, file=our_file, desc="inner", recorder=recorder,
+                                mininterval=0, miniters=1, leave=False) as t:
+                    for _ in range(3):
+                        t.update()
+                    t.reset(total=2)
+            assert trace.getvalue().startswith("[\n{")  # written incrementally
+        events = loads(trace.getvalue())
+
+    assert {e['ph'] for e in events} == set("MBCEi")
+    # one span per bar, nested by `pos`
+    begins = [e for e in events if e['ph'] == "B"]
+    assert [e['name'] for e in begins] == ["outer", "inner", "inner"]
+    assert [e['tid'] for e in begins] == [1, 2, 3]
+    assert [e['tid'] for e in events if e['ph'] == "E"] == [2, 3, 1]
+    sort_indices = [e['args']['sort_index'] for e in events
+                    if e.get('name') == "thread_sort_index"]
+    assert sort_indices == [0, 1, 1]
+    # counter samples, including those before `reset()`
+    inner = [e['args']['n'] for e in events if e['ph'] == "C" and e['tid'] == 2]
+    assert inner[:4] == [0, 1, 2, 3]
+    assert [e['tid'] for e in events if e['ph'] == "i"] == [2, 3]
+    assert all(a['ts'] <= b['ts'] for a, b in zip(events, events[1:]))
+
+
+def test_recorder_default(tmp_path):
+    """Test class-level `recorder` and file output"""
+    path = tmp_path / "trace.json"
+    tqdm_trace.recorder = recorder = ChromeTraceRecorder(str(path))
+    try:
+        with closing(StringIO()) as our_file:
+            with tqdm_trace(total=1, file=our_file):
+                pass
+            with tqdm_trace(total=1, file=our_file, disable=True):
+                pass
+    finally:
+        tqdm_trace.recorder = None
+    recorder.flush()
+    recorder.flush()  # idempotent
+    events = loads(path.read_text())
+    assert [e['ph'] for e in events if e['ph'] in "BE"] == ["B", "E"]
+    assert events[0]['args']['name'] == "tqdm 1"
+
+
+def test_binary_log():
+    """Test binary log records"""
+    with closing(StringIO()) as our_file, closing(BytesIO()) as log:
+        with BinaryRecorder(log) as recorder:
+            with tqdm_trace(total=3, file=our_file, recorder=recorder, mininterval=0,
+                            miniters=1) as t:
+                t.update(2)
+                t.format_dict  # no side effects
+                str(t)
+                t.reset()
+            with tqdm_trace(file=our_file, recorder=recorder, initial=1.5, desc="héllo"):
+                pass
+        data = log.getvalue()
+        assert data.startswith(MAGIC)
+        assert (len(data) - len(MAGIC)) % RECORD.size == 0
+        log.seek(0)
+        records = read_log(log)
+        assert [(i, e) for _, i, e, _, _ in records] == [
+            (1, START), (1, SAMPLE), (1, SAMPLE), (1, SAMPLE), (1, RESET), (1, SAMPLE),
+            (1, CLOSE), (2, START), (2, DESC), (2, SAMPLE), (2, SAMPLE), (2, CLOSE)]
+        assert [n for _, _, _, n, _ in records] == [0, 0, 2, 0, 0, 0, 0, 1.5, "héllo"] + [1.5] * 3
+        assert [total for _, _, _, _, total in records][-3:] == [None] * 3
+        # truncated
+        assert read_log(BytesIO(data[:-1])) == records[:-1]
+
+    with raises(ValueError):
+        read_log(BytesIO(b"garbage"))
@@ -3,9 +3,10 @@ import logging
 import subprocess  # nosec
 import sys
 from functools import wraps
+from io import StringIO
 from os import linesep
 
-from tqdm.cli import TqdmKeyError, TqdmTypeError, main
+from tqdm.cli import OPT_TYPES, TqdmKeyError, TqdmTypeError, main, parse_opts, posix_pipe
 from tqdm.utils import IS_WIN
 
 from .tests_tqdm import BytesIO, closing, mark, raises
@@ -95,6 +96,55 @@ def test_main_bytes(capsysbinary):
         assert str(len(IN_DATA)) + "B" in err.decode("U8")
 
 
+@mark.slow
+def test_pipes_bytes():
+    """Test command line --bytes pipes"""
+    data = b"tqdm" * 123456
+    res = subprocess.run(  # nosec
+        [sys.executable, '-c', 'from tqdm.cli import main; main()', '--bytes'],
+        input=data, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True)
+    assert res.stdout == data
+    assert b"482kB" in res.stderr
+
+
+def test_posix_pipe_zero_copy(tmp_path):
+    """Test posix_pipe(zero_copy=True)"""
+    data = bytes(range(256)) * 999
+    (tmp_path / "in").write_bytes(data)
+    for zero_copy in (False, True):
+        counts = []
+        with open(tmp_path / "in", 'rb') as fin, open(tmp_path / "out", 'wb') as fout:
+            fout.write(b"head")  # must be flushed first
+            posix_pipe(fin, fout, b'', 10000, counts.append, zero_copy=zero_copy)
+        assert (tmp_path / "out").read_bytes() == b"head" + data
+        assert sum(counts) == len(data)
+        assert max(counts) <= 10000
+
+
+@mark.parametrize("delim", [b'\n', b'\r\n', b'aa'])
+@mark.parametrize("buf_size", [1, 2, 3, 7, 1024])
+def test_posix_pipe_delim(delim, buf_size):
+    """Test posix_pipe line counting"""
+    for lines in ([], [b''], [b'1', b'22', b'', b'333'], [b'a', b'aaa', b'']):
+        data = delim.join(lines)
+        with closing(BytesIO(data)) as fin, closing(BytesIO()) as fout:
+            counts = []
+            posix_pipe(fin, fout, delim, buf_size, counts.append)
+            assert fout.getvalue() == data
+            expected = len(data.split(delim)) - data.endswith(delim) if data else 0
+            assert sum(counts) == expected
+            assert len(counts) <= len(data) // buf_size + 2  # once per chunk (& at EOF)
+
+        with closing(BytesIO(data)) as fin, closing(BytesIO()) as fout:
+            pieces = []
+            posix_pipe(fin, fout, delim, buf_size, pieces.append, callback_len=False)
+            assert fout.getvalue() == data
+            expected = data.split(delim)
+            if not expected[-1]:
+                expected.pop()
+            assert pieces == expected
+
+
 def test_main_log(capsysbinary, caplog):
     """Test CLI --log"""
     _SYS = sys.stdin, sys.argv
@@ -181,6 +231,33 @@ def test_main(capsysbinary):
     assert (str((N - 1) / 2.0) + "it").encode() in err
     assert (str(N / 2.0) + "it").encode() not in err
 
+    # test bulk --update (readable stdin, small chunks)
+    with closing(BytesIO()) as sys.stdin:
+        sys.stdin.write(IN_DATA)
+        sys.stdin.seek(0)
+        main(sys.stderr, ['--update', '--buf_size', '10'])
+        out, err = capsysbinary.readouterr()
+        assert out == IN_DATA
+        assert (str(sum(i / 2.0 for i in range(N))) + "it").encode() in err
+
+    # test --binary
+    for argv, n in ((['--update'], N // 2 * N), (['--update-to'], N - 1)):
+        IN_DATA = b''.join(i.to_bytes(8, 'little', signed=True) for i in range(N))
+        with closing(BytesIO()) as sys.stdin:
+            sys.stdin.write(IN_DATA)
+            sys.stdin.seek(0)
+            main(sys.stderr, argv + ['--binary', '--buf_size', '12'])
+            out, err = capsysbinary.readouterr()
+            assert out == IN_DATA
+            assert (str(n) + "it").encode() in err
+
+
+def test_opt_types():
+    """Test precomputed CLI options match the docstrings"""
+    opt_types, help_long = parse_opts()
+    assert OPT_TYPES == opt_types, "update `OPT_TYPES` to match `parse_opts()`"
+    assert all(f"--{o.replace('_', '-')}" in help_long for o in OPT_TYPES)
+
 
 @mark.slow
 @mark.skipif(IS_WIN, reason="no man pages on windows")
@@ -238,7 +315,44 @@ def test_exceptions(capsysbinary):
     out, _ = capsysbinary.readouterr()
     assert norm(out) == IN_DATA
 
+    with raises(TqdmKeyError, match="--binary requires"):
+        main(sys.stderr, argv=['--binary'])
+    out, _ = capsysbinary.readouterr()
+    assert norm(out) == IN_DATA
+
     # test SystemExits
     for i in ('-h', '--help', '-v', '--version'):
         with raises(SystemExit):
             main(argv=[i])
+
+
+def test_replay(tmp_path, capsys):
+    """Test CLI replay of binary logs"""
+    from tqdm.contrib.trace import BinaryRecorder, tqdm_trace
+
+    path = tmp_path / "progress.log"
+    with closing(StringIO()) as our_file:
+        for desc in ("a", ""):  # appends
+            with BinaryRecorder(str(path)) as recorder:
+                with tqdm_trace(total=10, file=our_file, recorder=recorder, desc=desc,
+                                mininterval=0, miniters=1) as t:
+                    for _ in range(10):
+                        t.update()
+
+    with closing(StringIO()) as our_file:
+        main(fp=our_file, argv=['replay', '--speed=0', str(path)])
+        res = our_file.getvalue()
+        assert "a: 100%" in res
+        assert "bar 2: 100%" in res
+
+    main(argv=['replay', str(path), '--summary'])
+    out = capsys.readouterr().out
+    assert out.startswith("29 records, 2 bars\n")
+    assert "bar 1 (a): +0s for " in out
+    assert "bar 2: +" in out
+    assert ", n=10/10, " in out
+    assert "it/s over time: " in out
+
+    for argv in (['replay'], ['replay', '--foo', str(path)], ['replay', str(path)] * 2):
+        with raises(TqdmKeyError):
+            main(argv=argv)
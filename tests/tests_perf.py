@@ -313,3 +313,21 @@ def test_manual_overhead_simplebar_hard():
             simplebar_update(10)
 
     assert_performance(10, 'tqdm', time_tqdm(), 'simple_progress', time_bench())
+
+
+def test_lazy_imports():
+    """Test `import tqdm` does not import slow/rarely used modules"""
+    import subprocess  # nosec
+    slow = ['tqdm.cli', 'tqdm.gui', 'tqdm.version', 'asyncio', 'datetime', 'inspect',
+            'logging', 'importlib.metadata']
+    res = subprocess.check_output([  # nosec
+        sys.executable, '-c',
+        f"import sys, tqdm.auto; print([m for m in {slow!r} if m in sys.modules])"])
+    assert res.strip() == b"[]"
+
+    import tqdm
+    assert tqdm.main is tqdm.cli.main
+    assert tqdm.__version__ == tqdm.version.__version__
+    assert 'tqdm_gui' in dir(tqdm)
+    with importorskip('pytest').raises(AttributeError):
+        tqdm.tqdm_does_not_exist  # pylint: disable=pointless-statement
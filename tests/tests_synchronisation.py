@@ -1,11 +1,13 @@
 import atexit
+from concurrent.futures import ThreadPoolExecutor
 from functools import wraps
 from threading import Event, RLock, Thread, current_thread
-from time import sleep, time
+from time import perf_counter, sleep, time
 
-from tqdm import TMonitor, tqdm, trange
+from tqdm import TMonitor, TqdmKeyError, tqdm, trange
+from tqdm._monitor import TRenderer
 
-from .tests_tqdm import StringIO, closing, importorskip, patch_lock, skip
+from .tests_tqdm import StringIO, closing, importorskip, patch_lock, raises, skip
 
 
 class Time:
@@ -107,6 +109,32 @@ def test_monitor_thread():
     del monitor
 
 
+@patch_sleep
+def test_monitor_deadlines():
+    """Test monitor only checks bars whose deadline passed"""
+    class Bar:
+        disable = False
+
+    monitor = TMonitor(FakeTqdm, 10)
+    monitor.exit()  # test scheduling without a running thread
+    bars = [Bar() for _ in range(4)]
+    for i, bar in enumerate(bars):
+        monitor.register(bar, i)
+    bars[0].disable = True  # closed
+    assert monitor.pop_due(2) == bars[1:3]
+    assert monitor.pop_due(2) == []
+    del bar, bars[3]
+    assert monitor.pop_due(3) == []  # garbage collected
+    new = type('New', (), {})()  # registered in `__new__` before `__init__` sets `disable`
+    monitor.register(new, 4)
+    assert monitor.pop_due(4) == [new]
+
+    renderer = TRenderer(FakeTqdm, 10)  # checks all its bars every frame
+    renderer.exit()
+    renderer.register(bars[1])
+    assert renderer.pop_due(float('inf')) == []
+
+
 @patch_sleep
 def test_monitoring_and_cleanup():
     """Test for stalled tqdm instance and monitor deletion"""
@@ -185,6 +213,74 @@ def test_monitoring_multi():
                 assert t2.miniters == 500  # check that t2 was not adjusted
 
 
+@patch_sleep
+def test_stall():
+    """Test stall detection by the monitor"""
+    reports = []
+    tqdm.stall_callback = lambda bar, msg: reports.append((bar, msg))
+    try:
+        with closing(StringIO()) as our_file:
+            with tqdm(total=10, file=our_file, desc="stuck", stall_timeout=15) as t:
+                t.update()
+                for _ in range(1000):
+                    if reports:
+                        break
+                    Time.fake_sleep(1)
+                (bar, msg), = reports
+                assert bar is t
+                assert msg.startswith("stuck: no progress for ")
+                assert "(n=1, total=10, since " in msg
+                assert "Stack of thread MainThread" in msg
+                assert "in test_stall" in msg
+
+                # reported once per stall
+                Time.fake_sleep(100)
+                monitor_t = Time.time()
+                while t.monitor.woken < monitor_t:
+                    Time.fake_sleep(1)
+                assert len(reports) == 1
+
+                t.update()
+                for _ in range(1000):
+                    if len(reports) > 1:
+                        break
+                    Time.fake_sleep(1)
+                assert "(n=2, total=10, since " in reports[-1][1]
+    finally:
+        tqdm.stall_callback = None
+
+
+@patch_sleep
+def test_stall_resolution():
+    """Test stalls are reported soon after `stall_timeout`"""
+    reports = []
+
+    class Bar:
+        disable, desc, total, maxinterval, miniters, stall_timeout = False, "", 9, 10, 1, 8
+
+        @property
+        def n(self):
+            return int(Time.time() >= self.progress_t)
+
+    class Tqdm(FakeTqdm):
+        _instances = set()
+        stall_callback = staticmethod(lambda bar, msg: reports.append(Time.time()))
+
+    Time.reset()
+    bar = Bar()
+    bar.start_t = Time.time()
+    bar.progress_t = bar.start_t + 11  # just after the first check
+    Tqdm._instances.add(bar)
+    monitor = TMonitor(Tqdm, 10)
+    timeout = time() + 5
+    while not reports and time() < timeout:
+        sleep(0.001)
+    monitor.exit()
+    assert reports, "stall not reported"
+    # checked every `stall_timeout / 4`: reported within 2 checks
+    assert reports[0] - bar.progress_t <= 8 + 2 * 2
+
+
 def test_imap():
     """Test multiprocessing.Pool"""
     try:
@@ -288,3 +384,72 @@ def test_monitor_atexit_does_not_deadlock_on_stuck_get_lock():
         if monitor is not None:
             monitor.was_killed.set()
             monitor.join(timeout=2.0)
+
+
+def test_background():
+    """Test background rendering thread"""
+    with closing(StringIO()) as our_file:
+        with tqdm(total=100, file=our_file, background=True, mininterval=0) as t:
+            assert t.renderer.is_alive()
+            initial = our_file.getvalue()
+            with tqdm.get_lock():  # block rendering: `update` must not need the lock
+                for _ in range(100):
+                    t.update()
+                assert our_file.getvalue() == initial
+            timeout = time() + 5
+            while "100/100" not in our_file.getvalue() and time() < timeout:
+                sleep(0.01)
+            assert "100/100" in our_file.getvalue()
+
+    with closing(StringIO()) as our_file:
+        for _ in tqdm(range(1000), file=our_file, background=True):
+            pass
+        assert "1000/1000" in our_file.getvalue()
+
+
+def test_sharded():
+    """Test lock-free multi-threaded updates"""
+    with closing(StringIO()) as our_file:
+        with tqdm(total=80000, file=our_file, sharded=True, mininterval=0) as t:
+            assert t.background
+            with ThreadPoolExecutor(8) as pool:
+                for _ in pool.map(lambda _: [t.update() for _ in range(10000)], range(8)):
+                    pass
+            t.refresh()
+            assert t.n == 80000
+            t.reset(total=2)
+            t.update(2)
+        assert t.n == 2
+        assert "2/2" in our_file.getvalue()
+
+
+def test_clock():
+    """Test `clock` sources"""
+    with closing(StringIO()) as our_file:
+        with tqdm(total=9, file=our_file, clock='monotonic') as t:
+            assert t._time is perf_counter
+        Time.reset()
+        with tqdm(total=9, file=our_file, clock=Time.time, miniters=1, mininterval=0) as t:
+            Time.fake_sleep(3)
+            t.update()
+        Time.reset()
+        assert "00:03" in our_file.getvalue()
+
+        with tqdm(total=9, file=our_file, clock='coarse') as t:
+            ticker = t.clock_ticker
+            assert ticker.is_alive()
+            assert ticker.bars == 1
+            start = t._time()
+            sleep(5 * t.clock_interval)
+            assert t._time() > start
+        timeout = time() + 5
+        while ticker.is_alive() and time() < timeout:
+            sleep(0.01)
+        assert not ticker.is_alive(), "should exit when no coarse bars remain"
+        assert ticker.bars == 0
+        with tqdm(total=9, file=our_file, clock='coarse') as t:
+            assert t.clock_ticker is not ticker, "should restart"
+            assert t.clock_ticker.is_alive()
+
+        with raises(TqdmKeyError, match="Unknown clock"):
+            tqdm(total=9, file=our_file, clock='foo')
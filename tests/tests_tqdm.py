@@ -7,10 +7,11 @@ import sys
 from contextlib import contextmanager
 from functools import wraps
 from warnings import catch_warnings, simplefilter
+from weakref import ref
 
 from pytest import importorskip, mark, raises, skip
 
-from tqdm import TqdmDeprecationWarning, TqdmWarning, tqdm, trange
+from tqdm import TqdmDeprecationWarning, TqdmKeyError, TqdmWarning, tqdm, trange
 from tqdm.contrib import DummyTqdmFile
 from tqdm.std import EMA, Bar
 
@@ -1060,6 +1061,11 @@ def test_bar_format():
         out = our_file.getvalue()
     assert "\r  0%|          |0/2-0/20.0None?it/s00:00?\r" in out
 
+    # Test repeated `{bar}`, nested format specs & conversions
+    format_meter = tqdm.format_meter
+    assert format_meter(8, 10, 12, prefix="ab", ascii=True,
+                        bar_format="{bar:5}|{desc!r:>{n}}|{bar:2}") == "#### |    'ab'|#6"
+
     # Test unicode string auto conversion
     with closing(StringIO()) as our_file:
         bar_format = r'hello world'
@@ -1275,6 +1281,40 @@ def test_position():
         t1.close()
 
 
+def test_position_allocation():
+    """Test reuse of free positions and repositioning of overflow bars"""
+    with closing(StringIO()) as our_file:
+        kwargs = {'file': our_file, 'leave': False, 'nrows': 4, 'delay': 100}
+        bars = [tqdm(total=1, **kwargs) for _ in range(6)]
+        fixed = tqdm(total=1, position=7, **kwargs)
+        assert [t.pos for t in bars] == list(range(6))
+        bars[1].close()
+        assert bars[3].pos == 1  # lowest overflow (`pos >= nrows - 1`) moved up
+        bars[0].close()
+        assert bars[4].pos == 0
+        bars[2].close()
+        assert bars[5].pos == 2
+        new = [tqdm(total=1, **kwargs) for _ in range(5)]
+        assert [t.pos for t in new] == [3, 4, 5, 6, 8]  # 7 is fixed
+        for t in bars[3:] + new + [fixed]:
+            t.close()
+        assert not tqdm._positions.used
+        with tqdm(total=1, **kwargs) as t:
+            assert t.pos == 0
+
+        # bars collected by `gc` (weakrefs cleared before `__del__`) release `pos`
+        import gc
+        with tqdm(total=1, **kwargs):
+            pos = []
+            for _ in range(4):
+                t = tqdm(total=1, **kwargs)
+                pos.append(t.pos)
+                t.cycle = t
+                del t
+                gc.collect()
+            assert pos == [1, 1, 1, 1]
+
+
 def test_set_description():
     """Test set description"""
     with closing(StringIO()) as our_file:
@@ -1532,6 +1572,271 @@ def test_write():
     sys.stdout = stdo
 
 
+def test_refresh_all():
+    """Test composing multiple bars into a single frame"""
+    with closing(StringIO()) as our_file:
+        writes = []
+        write = our_file.write
+
+        def counting_write(s):
+            writes.append(s)
+            return write(s)
+
+        our_file.write = counting_write
+        bars = [tqdm(total=10, file=our_file, desc=f'pos{i} bar', bar_format='{l_bar}',
+                     mininterval=0, miniters=1) for i in range(3)]
+        for t in bars:
+            t.n = 5
+        before = squash_ctrlchars(our_file.getvalue())
+        del writes[:]
+        tqdm.refresh_all(bars)
+        assert len(writes) == 1
+        assert squash_ctrlchars(our_file.getvalue()) == [
+            f'pos{i} bar:  50%|' for i in range(3)]
+        assert before == [f'pos{i} bar:   0%|' for i in range(3)]
+
+        # unchanged lines are skipped
+        bars[1].n = 6
+        tqdm.refresh_all(bars)
+        assert len(writes) == 2
+        assert writes[-1] == '\n\rpos1 bar:  60%|\x1b[A'
+        tqdm.refresh_all(bars)
+        assert len(writes) == 2
+
+        # clear
+        tqdm.sync_output = True
+        try:
+            tqdm.refresh_all(bars, clear=True)
+        finally:
+            tqdm.sync_output = False
+        assert len(writes) == 3
+        assert writes[-1].startswith('\x1b[?2026h') and writes[-1].endswith('\x1b[?2026l')
+        assert [i.strip() for i in squash_ctrlchars(our_file.getvalue().replace(
+            '\x1b[?2026h', '').replace('\x1b[?2026l', ''))] == ['', '', '']
+        for t in bars:
+            t.close()
+
+    # subclasses overriding `display()` are not bypassed
+    class Displays(tqdm):
+        def display(self, *args, **kwargs):
+            displays.append(self.n)
+            return super().display(*args, **kwargs)
+
+    with closing(StringIO()) as our_file:
+        displays = []
+        with Displays(total=10, file=our_file, mininterval=0, miniters=1) as t:
+            t.n = 5
+            tqdm.refresh_all([t])
+            assert displays[-1] == 5
+
+
+def test_predictive_miniters():
+    """Test predictive_miniters"""
+    calls = {}
+    for predictive in (False, True):
+        state = {'n': 0, 'calls': 0}
+
+        def clock():
+            state['calls'] += 1
+            return state['n'] * 1e-4
+
+        with closing(StringIO()) as our_file:
+            for i in tqdm(range(20000), file=our_file, clock=clock, mininterval=0.1,
+                          predictive_miniters=predictive):
+                state['n'] = i + 1
+            assert our_file.getvalue().count('\r') >= 20
+        calls[predictive] = state['calls']
+    assert calls[True] < 100 < calls[False]
+
+    # no progress: keep checking every iteration at most
+    with closing(StringIO()) as our_file:
+        with tqdm(total=10, file=our_file, predictive_miniters=True) as t:
+            assert t._predict_miniters(0, 1) >= 1
+            t.miniters = 5
+            assert t._predict_miniters(0, 1) == 5
+
+
+def test_render_budget():
+    """Test render_budget"""
+    from time import sleep
+
+    class SlowFile(StringIO):
+        def write(self, s):
+            sleep(0.002)
+            return super().write(s)
+
+    with closing(SlowFile()) as our_file:
+        t = tqdm(total=10, file=our_file, mininterval=0, maxinterval=0.1,
+                 render_budget=0.01)
+        assert t.render_t >= 0.002
+        assert t.mininterval >= 0.2
+        assert t.maxinterval == t.mininterval
+        t.update()
+        assert not t.update()  # throttled
+        t.mininterval = 5  # user changes are kept
+        t.refresh()
+        assert t.mininterval >= 5
+        assert t.maxinterval >= 5
+        t.close()
+
+
+def test_stats():
+    """Test stats"""
+    with closing(StringIO()) as our_file:
+        with tqdm(range(10), file=our_file, desc="pos0", mininterval=0,
+                  stats=True) as t:
+            for _ in t:
+                pass
+            stats = t.format_dict['stats']
+        assert set(stats) == {'update', 'format_meter', 'lock', 'write'}
+        assert all(v > 0 for v in stats.values())
+        assert t._overhead.calls['update'] == 10
+        assert "pos0: tqdm overhead: update " in our_file.getvalue()
+
+    # no reference cycles (freed without `gc`), also with `sharded`
+    for sharded in (False, True):
+        with closing(StringIO()) as our_file:
+            t = tqdm(total=10, file=our_file, stats=True, sharded=sharded)
+            t.update(3)
+            t.close()
+            assert t._overhead.calls['update'] == 1
+            assert t.n == 3
+            t = ref(t)
+            assert t() is None
+
+    # class-level default
+    tqdm.stats = True
+    try:
+        with closing(StringIO()) as our_file:
+            with tqdm(total=1, file=our_file) as t:
+                assert 'stats' in t.format_dict
+            with tqdm(total=1, file=our_file, stats=False) as t:
+                assert 'stats' not in t.format_dict
+    finally:
+        tqdm.stats = False
+
+
+def test_histogram():
+    """Test histogram percentiles"""
+    from tqdm.std import Histogram
+    hist = Histogram()
+    assert all(x != x for x in hist.percentiles(50, 99))  # nan
+    for i in range(1, 1001):
+        hist.add(i)
+    p50, p99 = hist.percentiles(50, 99)
+    assert abs(p50 - 500) < 25
+    assert abs(p99 - 990) < 50
+
+    state = {'t': 0}
+    with closing(StringIO()) as our_file:
+        with tqdm(total=100, file=our_file, clock=lambda: state['t'], mininterval=0,
+                  miniters=1, histogram=True, bar_format="{n} {p50:.1e} {p95:.1e}") as t:
+            for i in range(100):
+                state['t'] += 0.1 if i % 10 == 9 else 0.001
+                t.update()
+            d = t.format_dict
+        assert abs(d['p50'] - 0.001) < 1e-4
+        assert abs(d['p95'] - 0.1) < 1e-2
+        assert d['p99'] >= d['p95']
+        assert "\r100 1.0e-03 9.9e-02" in our_file.getvalue()
+
+
+def test_estimator():
+    """Test rate estimators"""
+    from math import sqrt
+
+    from tqdm.std import DecayRate, RateEstimator, RegressionRate, WindowRate
+
+    # irregular samples at a constant rate
+    for estimator in (RateEstimator(), WindowRate(), DecayRate(), RegressionRate()):
+        for t in (0, 0.01, 1, 1.01, 1.02, 3, 3.5):
+            estimator.add(100 * t, t)
+        assert abs(estimator.rate() - 100) < 1e-6
+
+    # accelerating: n = 10 * t + t ** 2
+    window = WindowRate(window=2)
+    regression = RegressionRate()
+    for i in range(101):
+        t = i / 10
+        window.add(10 * t + t ** 2, t)
+        regression.add(10 * t + t ** 2, t)
+    assert abs(window.rate() - 28) < 1e-6  # average over t in [8, 10]
+    assert abs(regression.rate() - 30) < 1e-6  # current rate
+    # reaches 500 at t = -5 + sqrt(525)
+    assert abs(regression.rate(200, 500) - 300 / (sqrt(525) - 15)) < 1e-6
+    regression.reset()
+    assert regression.rate() is None
+
+    state = {'t': 0}
+    with closing(StringIO()) as our_file:
+        with tqdm(total=1000, file=our_file, clock=lambda: state['t'], mininterval=0,
+                  miniters=1, estimator='window') as t:
+            for _ in range(200):
+                state['t'] += 0.1
+                t.update(10 if state['t'] < 5 else 1)  # slows down
+            assert abs(t.format_dict['rate'] - 10) < 1e-6
+            assert "650/1000 [00:20<00:35" in str(t)
+
+    with raises(TqdmKeyError, match="Unknown estimator: 'magic' .*'window'"):
+        tqdm(total=10, estimator='magic')
+
+
+def test_jsonl():
+    """Test JSON lines output"""
+    from json import loads
+
+    state = {'t': 0}
+    with closing(StringIO()) as our_file:
+        with tqdm(total=100, file=our_file, clock=lambda: state['t'], mininterval=0,
+                  miniters=1, desc="pos0", jsonl=None) as t:
+            for i in range(100):
+                state['t'] = (i + 1) / 10
+                t.update()
+                if t.n == 50:
+                    t.set_postfix(x=1, refresh=False)
+                    tqdm.write("msg", file=our_file)
+        lines = our_file.getvalue().splitlines()
+        assert "msg" in lines
+        records = [loads(i) for i in lines if i != "msg"]
+        # initial, every second, final
+        assert [r['n'] for r in records] == list(range(0, 101, 10)) + [100]
+        rate, remaining = records[5].pop('rate'), records[5].pop('remaining')
+        assert abs(rate - 10) < 1e-6 and abs(remaining - 5) < 1e-6
+        assert records[5] == {
+            'desc': "pos0", 'n': 50, 'total': 100, 'unit': "it", 'elapsed': 5,
+            'postfix': None}
+        assert records[6]['postfix'] == "x=1"
+        assert records[-1]['closed']
+        assert all('closed' not in r for r in records[:-1])
+
+    # non-finite/non-builtin numbers
+    from fractions import Fraction
+    with closing(StringIO()) as our_file:
+        with tqdm(total=float('nan'), file=our_file, mininterval=0, jsonl=True) as t:
+            t.update(Fraction(1, 2))
+        records = [loads(i) for i in our_file.getvalue().splitlines()]
+        assert records[-1]['n'] == 0.5
+        assert records[-1]['total'] is None
+
+    # stats in final record
+    with closing(StringIO()) as our_file:
+        with tqdm(total=2, file=our_file, mininterval=0, jsonl=True, stats=True) as t:
+            t.update(2)
+        records = [loads(i) for i in our_file.getvalue().splitlines()]
+        assert records[-1]['closed']
+        assert records[-1]['stats']['update']['calls'] == 1
+        assert all('stats' not in r for r in records[:-1])
+
+    class TTY(StringIO):
+        def isatty(self):
+            return True
+
+    with closing(TTY()) as our_file:
+        with tqdm(total=10, file=our_file, jsonl=None):
+            pass
+        assert "0/10" in our_file.getvalue()
+
+
 def test_len():
     """Test advance len (numpy array shape)"""
     np = importorskip('numpy')
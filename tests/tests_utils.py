@@ -4,7 +4,7 @@ from typing import Union  # py<3.10
 
 import pytest
 
-from tqdm.utils import envwrap
+from tqdm.utils import FormatTemplate, envwrap
 
 
 def test_envwrap_deprecated(monkeypatch):
@@ -66,3 +66,22 @@ def test_envwrap_annotations(monkeypatch):
         return number, string
 
     assert 1.1, "1.1" == annotated()
+
+
+def test_format_template():
+    """Test FormatTemplate"""
+    kwargs = {'a': "x", 'b': [1, 2], 'c': 1.5, 'w': 6}
+    for fmt in ("", "plain", "{a}", "{a!r:>5}|{b[1]}|{c.real}", "{c:{w}.2f}", "{{{a}}}"):
+        t = FormatTemplate(fmt)
+        assert ''.join(t.render(kwargs)) == fmt.format(**kwargs)
+    t = FormatTemplate.compile("{a}-{b}:{c:{w}}")
+    assert t is FormatTemplate.compile("{a}-{b}:{c:{w}}")
+    assert t.fields == {'a', 'b', 'c', 'w'}
+    assert t.render(kwargs, defer=('b', 'c')) == ["x", "-", ('b', ''), ":", ('c', '6')]
+
+    with pytest.raises(KeyError):
+        FormatTemplate("{missing}").render(kwargs)
+    with pytest.raises(IndexError):
+        FormatTemplate("{}")
+    with pytest.raises(ValueError):
+        FormatTemplate("{a!x}")
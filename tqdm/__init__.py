@@ -1,12 +1,7 @@
 from ._monitor import TMonitor, TqdmSynchronisationWarning
-from ._tqdm_pandas import tqdm_pandas
-from .cli import main  # TODO: remove in v5.0.0
-from .gui import tqdm as tqdm_gui  # TODO: remove in v5.0.0
-from .gui import trange as tgrange  # TODO: remove in v5.0.0
 from .std import (
     TqdmDeprecationWarning, TqdmExperimentalWarning, TqdmKeyError, TqdmMonitorWarning,
     TqdmTypeError, TqdmWarning, tqdm, trange)
-from .version import __version__
 
 __all__ = ['tqdm', 'tqdm_gui', 'trange', 'tgrange', 'tqdm_pandas',
            'tqdm_notebook', 'tnrange', 'main', 'TMonitor',
@@ -15,6 +10,34 @@ __all__ = ['tqdm', 'tqdm_gui', 'trange', 'tgrange', 'tqdm_pandas',
            'TqdmExperimentalWarning',
            'TqdmMonitorWarning', 'TqdmSynchronisationWarning',
            '__version__']
+# rarely used members, imported on first access (see `__getattr__`)
+_LAZY = {
+    'main': ('.cli', 'main'),  # TODO: remove in v5.0.0
+    'tqdm_gui': ('.gui', 'tqdm'),  # TODO: remove in v5.0.0
+    'tgrange': ('.gui', 'trange'),  # TODO: remove in v5.0.0
+    'tqdm_pandas': ('._tqdm_pandas', 'tqdm_pandas'),
+    '__version__': ('.version', '__version__'),
+    # submodules previously imported eagerly
+    'cli': ('.cli', None), 'gui': ('.gui', None), 'version': ('.version', None),
+    '_tqdm_pandas': ('._tqdm_pandas', None)}
+
+
+def __getattr__(name):
+    """Lazily import rarely used members to reduce `import tqdm` time."""
+    try:
+        module, attr = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    from importlib import import_module
+    res = import_module(module, __name__)
+    if attr is not None:
+        res = getattr(res, attr)
+    globals()[name] = res
+    return res
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
 
 
 def tqdm_notebook(*args, **kwargs):  # pragma: no cover
@@ -1,9 +1,12 @@
 import atexit
-from threading import Event, Thread, current_thread
-from time import time
-from warnings import warn
+import sys
+from heapq import heappop, heappush
+from itertools import count
+from threading import Event, Thread, current_thread, enumerate as threads
+from time import localtime, perf_counter, strftime, time
+from weakref import WeakSet, ref
 
-__all__ = ["TMonitor", "TqdmSynchronisationWarning"]
+__all__ = ["TMonitor", "TRenderer", "TClock", "TqdmSynchronisationWarning"]
 
 
 class TqdmSynchronisationWarning(RuntimeWarning):
@@ -18,24 +21,32 @@ class TMonitor(Thread):
     Monitoring thread for tqdm bars.
     Monitors if tqdm bars are taking too much time to display
     and readjusts miniters automatically if necessary.
+    Bars are checked only once their (`maxinterval`) deadline passes
+    (see `register()`), so each check costs O(overdue bars).
+    Also reports bars which made no progress for their `stall_timeout`.
 
     Parameters
     ----------
     tqdm_cls  : class
         tqdm class to use (can be core tqdm or a submodule).
     sleep_interval  : float
-        Time to sleep between monitoring checks.
+        Maximum time to sleep between monitoring checks.
     """
     _test = {}  # internal vars for unit testing
+    thread_name = "tqdm_monitor"
 
     def __init__(self, tqdm_cls, sleep_interval):
-        Thread.__init__(self, name="tqdm_monitor")
+        Thread.__init__(self, name=self.thread_name)
         self.daemon = True  # kill thread when main killed (KeyboardInterrupt)
         self.woken = 0  # last time woken up, to sync with monitor
         self.tqdm_cls = tqdm_cls
         self.sleep_interval = sleep_interval
         self._time = self._test.get("time", time)
         self.was_killed = self._test.get("Event", Event)()
+        # heap of `(deadline, seq, weakref(instance))` checks due
+        self._deadlines, self._seq = [], count()
+        for instance in tqdm_cls._instances.copy():
+            self.register(instance)
         atexit.register(self._atexit_signal)
         self.start()
 
@@ -59,46 +70,258 @@ class TMonitor(Thread):
                 # Avoid race by checking that the instance started
                 if hasattr(i, 'start_t')]
 
+    def register(self, instance, deadline=None):
+        """
+        Schedules a check of `instance` at `deadline` [default: now].
+        Requires `tqdm_cls.get_lock()` to be held.
+        """
+        heappush(self._deadlines, (self._time() if deadline is None else deadline,
+                                   next(self._seq), ref(instance)))
+
+    def pop_due(self, cur_t):
+        """
+        Returns (live) instances whose deadline is at or before `cur_t`.
+        Requires `tqdm_cls.get_lock()` to be held.
+        """
+        due, deadlines = [], self._deadlines
+        while deadlines and deadlines[0][0] <= cur_t:
+            instance = heappop(deadlines)[2]()
+            # Closed instances are simply not rescheduled
+            if instance is not None and not getattr(instance, 'disable', False):
+                due.append(instance)
+        return due
+
     def run(self):
         cur_t = self._time()
+        wait = self.sleep_interval
         while True:
             # After processing and before sleeping, notify that we woke
             # Need to be done just before sleeping
             self.woken = cur_t
             # Sleep some time...
-            self.was_killed.wait(self.sleep_interval)
+            self.was_killed.wait(wait)
             # Quit if killed
             if self.was_killed.is_set():
                 return
-            # Then monitor!
-            # Acquire lock (to access _instances)
+            # Then monitor! Only instances whose deadline passed are
+            # snapshotted under the lock, then checked outside it
+            # (each refresh only briefly holds the lock)
             with self.tqdm_cls.get_lock():
                 cur_t = self._time()
-                # Check tqdm instances are waiting too long to print
+                instances = self.pop_due(cur_t)
+            stalled, deadlines = [], []
+            for instance in instances:
+                # Check event in loop to reduce blocking time on exit
+                if self.was_killed.is_set():
+                    return
+                if not hasattr(instance, 'start_t'):  # not yet started
+                    deadlines.append((instance, cur_t + self.sleep_interval))
+                    continue
+                maxinterval = instance.maxinterval or 0
+                deadline = cur_t + (maxinterval or self.sleep_interval)
+                # Only if mininterval > 1 (else iterations are just slow)
+                # and last refresh exceeded maxinterval
+                # (background bars are handled by `TRenderer`)
+                if not getattr(instance, 'background', False) and instance.miniters > 1:
+                    elapsed = instance._time() - instance.last_print_t
+                    if elapsed >= maxinterval:
+                        with self.tqdm_cls.get_lock():
+                            # skip if closed (and maybe repositioned) meanwhile
+                            if instance.disable or instance not in self.tqdm_cls._instances:
+                                continue
+                            # force bypassing miniters on next iteration
+                            # (dynamic_miniters adjusts mininterval automatically)
+                            instance.miniters = 1
+                            # Refresh now! (works only for manual tqdm)
+                            instance.refresh(nolock=True)
+                    else:
+                        deadline = cur_t + maxinterval - elapsed
+                if getattr(instance, 'stall_timeout', None):
+                    if self.check_stall(instance, cur_t):
+                        stalled.append(instance)
+                    # progress is seen at most this late, so stalls are
+                    # reported at most 2 checks after `stall_timeout`
+                    deadline = min(deadline, cur_t + min(
+                        instance.stall_timeout / 4, self.sleep_interval))
+                deadlines.append((instance, deadline))
+                # Remove accidental long-lived strong reference
+                del instance
+            with self.tqdm_cls.get_lock():
+                for instance, deadline in deadlines:
+                    self.register(instance, deadline)
+                # wake up for the next (e.g. stall) check due, if sooner
+                wait = self.sleep_interval
+                if self._deadlines:
+                    wait = min(wait, max(self._deadlines[0][0] - cur_t, 0))
+            # Remove accidental long-lived strong references
+            del instances, deadlines
+            # report outside the lock (callbacks may e.g. `tqdm.write()`)
+            for instance in stalled:
+                self.report_stall(instance, cur_t)
+            del stalled
+
+    @staticmethod
+    def check_stall(instance, cur_t):
+        """
+        Returns whether `instance` has (just) made no progress for its
+        `stall_timeout`. Each stall is only reported once.
+        """
+        n = instance.n
+        stall = getattr(instance, '_stall', None)  # [n, last progress time, reported]
+        if stall is None or stall[0] != n:
+            instance._stall = [n, cur_t, False]
+            return False
+        if stall[2] or cur_t - stall[1] < instance.stall_timeout:
+            return False
+        stall[2] = True
+        return True
+
+    def report_stall(self, instance, cur_t):
+        """
+        Calls `tqdm_cls.stall_callback(instance, message)`, or logs a warning
+        with the stack of the thread last seen iterating/updating `instance`.
+        """
+        n, last_t, _ = instance._stall
+        msg = [f"{instance.desc or 'tqdm'}: no progress for {cur_t - last_t:.0f}s"
+               f" (n={n}, total={instance.total}, since {strftime('%X', localtime(last_t))})"]
+        ident = getattr(instance, '_thread_id', None)
+        frame = sys._current_frames().get(ident)
+        if frame is not None:
+            from traceback import format_stack  # slow import
+            name = next((i.name for i in threads() if i.ident == ident), ident)
+            msg.append(f"Stack of thread {name} (most recent call last):\n"
+                       + ''.join(format_stack(frame)).rstrip('\n'))
+            del frame
+        msg = '\n'.join(msg)
+        callback = getattr(self.tqdm_cls, 'stall_callback', None)
+        if callback is None:
+            import logging  # slow import
+            logging.getLogger(__name__).warning(msg)
+        else:
+            callback(instance, msg)
+
+    def report(self):
+        return not self.was_killed.is_set()
+
+
+class TRenderer(TMonitor):
+    """
+    Rendering thread for `background` tqdm bars.
+    Periodically refreshes bars whose `update()`/iteration only
+    increments `n`, taking display work off the calling threads.
+    Exits once no `background` bars remain.
+
+    Parameters
+    ----------
+    tqdm_cls  : class
+        tqdm class to use (can be core tqdm or a submodule).
+    sleep_interval  : float
+        Time to sleep between frames.
+    """
+    thread_name = "tqdm_renderer"
+
+    def __init__(self, tqdm_cls, sleep_interval):
+        # `background` bars (see `add()`), so as not to scan all bars every frame
+        self.instances = WeakSet(i for i in tqdm_cls._instances.copy()
+                                 if getattr(i, 'background', False))
+        super().__init__(tqdm_cls, sleep_interval)
+
+    def add(self, instance):
+        """Renders `instance` (if `background`) from now on."""
+        self.instances.add(instance)
+
+    def get_instances(self):
+        # returns a copy of started `background` instances (forgetting closed ones)
+        instances = self.tqdm_cls._instances
+        res = []
+        for i in self.instances.copy():
+            if i not in instances:
+                self.instances.discard(i)
+            elif hasattr(i, 'start_t'):
+                res.append(i)
+        return res
+
+    def register(self, instance, deadline=None):
+        """No-op: all `background` bars are checked every frame."""
+
+    def run(self):
+        while True:
+            self.woken = self._time()
+            self.was_killed.wait(self.sleep_interval)
+            if self.was_killed.is_set():
+                return
+            with self.tqdm_cls.get_lock():
                 instances = self.get_instances()
-                for instance in instances:
-                    # Check event in loop to reduce blocking time on exit
-                    if self.was_killed.is_set():
-                        return
-                    # Only if mininterval > 1 (else iterations are just slow)
-                    # and last refresh exceeded maxinterval
-                    if (
-                        instance.miniters > 1
-                        and (cur_t - instance.last_print_t) >= instance.maxinterval
-                    ):
-                        # force bypassing miniters on next iteration
-                        # (dynamic_miniters adjusts mininterval automatically)
-                        instance.miniters = 1
-                        # Refresh now! (works only for manual tqdm)
-                        instance.refresh(nolock=True)
-                    # Remove accidental long-lived strong reference
-                    del instance
-                if instances != self.get_instances():  # pragma: nocover
-                    warn("Set changed size during iteration" +
-                         " (see https://github.com/tqdm/tqdm/issues/481)",
-                         TqdmSynchronisationWarning, stacklevel=2)
+                if not instances:
+                    # let the next `background` bar start a new thread
+                    self.was_killed.set()
+                    return
+                # compose all due bars into one frame (per file)
+                self.tqdm_cls.refresh_all(
+                    [i for i in instances if self.schedule(i)], nolock=True)
                 # Remove accidental long-lived strong references
                 del instances
 
-    def report(self):
-        return not self.was_killed.is_set()
+    @staticmethod
+    def schedule(instance):
+        """
+        Returns whether `instance` is due for a refresh (i.e. progressed or
+        exceeded `maxinterval`), updating its statistics accordingly.
+        """
+        cur_t = instance._time()
+        if instance.disable or cur_t < instance.start_t + instance.delay:
+            return False
+        instance._fold_shards()
+        n = instance.n  # may be concurrently incremented
+        dt = cur_t - instance.last_print_t
+        dn = n - instance.last_print_n
+        if not ((dn and dt >= instance.mininterval)
+                or (instance.maxinterval and dt >= instance.maxinterval)):
+            return False
+        if instance.smoothing and dt and dn:
+            # EMA (not just overall average)
+            instance._ema_dn(dn)
+            instance._ema_dt(dt)
+        if getattr(instance, 'histogram', None) is not None and dn > 0:
+            instance.histogram.add(dt / dn, dn)
+        if getattr(instance, 'estimator', None) is not None:
+            instance.estimator.add(n, cur_t)
+        # Store old values for next frame
+        instance.last_print_n = n
+        instance.last_print_t = cur_t
+        return True
+
+
+class TClock(TMonitor):
+    """
+    Coarse clock thread for `clock="coarse"` tqdm bars.
+    Periodically stores `time.perf_counter()` in `now`, so that reading
+    the time is a cheap attribute lookup.
+    Exits once no `clock="coarse"` bars remain (i.e. `bars` drops to 0).
+
+    Parameters
+    ----------
+    tqdm_cls  : class
+        tqdm class to use (can be core tqdm or a submodule).
+    sleep_interval  : float
+        Time to sleep between ticks (i.e. clock resolution).
+    """
+    thread_name = "tqdm_clock"
+
+    def __init__(self, tqdm_cls, sleep_interval):
+        self.now = perf_counter()
+        self.bars = 0  # number of open bars using this clock (updated under lock)
+        super().__init__(tqdm_cls, sleep_interval)
+
+    def register(self, instance, deadline=None):
+        """No-op: bars are not checked."""
+
+    def run(self):
+        while not self.was_killed.wait(self.sleep_interval):
+            self.now = perf_counter()
+            if not self.bars:
+                with self.tqdm_cls.get_lock():
+                    if not self.bars:
+                        # let the next `clock="coarse"` bar start a new thread
+                        self.was_killed.set()
+                        return
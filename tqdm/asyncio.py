@@ -7,7 +7,6 @@ Usage:
 >>> async for i in trange(10):
 ...     ...
 """
-import asyncio
 from sys import version_info
 
 from .std import tqdm as std_tqdm
@@ -59,6 +58,7 @@ class tqdm_asyncio(std_tqdm):
         """
         Wrapper for `asyncio.as_completed`.
         """
+        import asyncio  # slow import
         if total is None:
             total = len(fs)
         kwargs = {}
@@ -2,13 +2,13 @@
 Module version for monitoring CLI pipes (`... | python -m tqdm | ...`).
 """
 import logging
+import os
 import re
 import sys
-from ast import literal_eval
+from array import array
 from textwrap import indent
 
 from .std import TqdmKeyError, TqdmTypeError, tqdm
-from .version import __version__
 
 __all__ = ["main"]
 log = logging.getLogger(__name__)
@@ -35,6 +35,7 @@ def cast(val, typ):
         if len(val) == 1:
             return val.encode()
         if re.match(r"^\\\w+$", val):
+            from ast import literal_eval
             return literal_eval(f'"{val}"').encode()
         raise TqdmTypeError(f"{val} : {typ}")
     if typ == 'str':
@@ -52,61 +53,222 @@ def cast(val, typ):
     raise TqdmTypeError(f"{val} : {typ}")
 
 
-def posix_pipe(fin, fout, delim=b'\\n', buf_size=256,
-               callback=lambda float: None, callback_len=True):
+def number(val):
+    """`int`, `float`, or (fallback) `literal_eval` of `val : bytes`"""
+    try:
+        return int(val)
+    except ValueError:
+        try:
+            return float(val)
+        except ValueError:
+            from ast import literal_eval
+            return literal_eval(val.decode())
+
+
+def update_callback(t, update_to=False):
+    """
+    Returns a `callback(pieces : list(bytes))` (for `posix_pipe(...,
+    callback_pieces=True)`) which parses numbers in bulk and calls
+    `t.update` once.
+
+    Parameters
+    ----------
+    t  : tqdm
+    update_to  : bool, optional
+        If (default: False), pass the sum of numbers to `t.update()`.
+        Otherwise, only the last number is used as the new `t.n`.
+    """
+    if update_to:
+        def callback(pieces):
+            t.update(number(pieces[-1]) - t.n)
+    else:
+        def callback(pieces):
+            try:
+                n = sum(map(int, pieces))  # fast path
+            except ValueError:
+                n = sum(map(number, pieces))
+            t.update(n)
+    return callback
+
+
+def binary_pipe(fin, fout, buf_size=2 ** 16, callback=lambda numbers: None):
+    """
+    Params
+    ------
+    fin  : binary file with `read(buf_size : int)` method
+      containing a stream of little-endian signed 64-bit integers.
+    fout  : binary file with `write` (and optionally `flush`) methods.
+    callback  : function(array('q')), called once per chunk.
+    """
+    read = getattr(fin, 'read1', None) or fin.read
+    fp_write = fout.write
+    buf = b''  # incomplete integer
+    while True:
+        tmp = read(buf_size)
+
+        # flush at EOF
+        if not tmp:
+            getattr(fout, 'flush', lambda: None)()
+            if buf:
+                raise TqdmTypeError(f"{len(buf)} trailing bytes : int64")
+            return
+
+        fp_write(tmp)
+        data = buf + tmp if buf else tmp
+        end = len(data) - len(data) % 8
+        buf = data[end:]
+        if end:
+            numbers = array('q', data[:end])
+            if sys.byteorder != 'little':  # pragma: no cover
+                numbers.byteswap()
+            callback(numbers)
+
+
+def _fileno(f):
+    """`f.fileno()` or `None`"""
+    try:
+        return f.fileno()
+    except (AttributeError, OSError, ValueError):  # incl. io.UnsupportedOperation
+        return None
+
+
+def copy_fd(fd_in, fd_out, buf_size, callback):
+    """
+    Copies `fd_in` to `fd_out` without passing data through userspace
+    (`os.splice` if either is a pipe, otherwise `os.sendfile`),
+    calling `callback(n_bytes)` after each chunk.
+
+    Returns `False` (having copied nothing) if unsupported.
+    """
+    copies = []
+    if hasattr(os, 'splice'):
+        copies.append(lambda: os.splice(fd_in, fd_out, buf_size))
+    if sys.platform.startswith('linux') and hasattr(os, 'sendfile'):
+        # Linux allows any `fd_out`
+        copies.append(lambda: os.sendfile(fd_out, fd_in, None, buf_size))
+    for copy in copies:
+        try:
+            n = copy()
+        except OSError:  # e.g. neither is a pipe, `fd_in` is not a regular file
+            continue
+        while n:
+            callback(n)
+            n = copy()
+        return True
+    return False
+
+
+def posix_pipe(fin, fout, delim=b'\\n', buf_size=2 ** 16,
+               callback=lambda float: None, callback_len=True, zero_copy=False,
+               callback_pieces=False):
     """
     Params
     ------
     fin  : binary file with `read(buf_size : int)` method
+      (and optionally `readinto1`/`readinto`).
     fout  : binary file with `write` (and optionally `flush`) methods.
     callback  : function(float), e.g.: `tqdm.update`
     callback_len  : If (default: True) do `callback(len(buffer))`.
       Otherwise, do `callback(data) for data in buffer.split(delim)`.
+    callback_pieces  : If (default: False) and not `callback_len`, do
+      `callback(list_of_data)` once per chunk instead.
+    zero_copy  : If (default: False) and `not delim`, copy between the
+      underlying file descriptors (if any) using `copy_fd`.
+      Assumes nothing has been read from `fin` yet.
     """
     fp_write = fout.write
 
     if not delim:
+        if zero_copy:
+            fd_in, fd_out = _fileno(fin), _fileno(fout)
+            if fd_in is not None and fd_out is not None:
+                getattr(fout, 'flush', lambda: None)()
+                if copy_fd(fd_in, fd_out, buf_size, callback):
+                    return
+
+        readinto = getattr(fin, 'readinto1', None) or getattr(fin, 'readinto', None)
+        if readinto is None:
+            while True:
+                tmp = fin.read(buf_size)
+
+                # flush at EOF
+                if not tmp:
+                    getattr(fout, 'flush', lambda: None)()
+                    return
+
+                fp_write(tmp)
+                callback(len(tmp))
+
+        # reuse one buffer rather than allocating per chunk
+        buf = bytearray(buf_size)
+        view = memoryview(buf)
+        while True:
+            n = readinto(buf)
+
+            # flush at EOF
+            if not n:
+                getattr(fout, 'flush', lambda: None)()
+                return
+
+            fp_write(view[:n])
+            callback(n)
+        # return
+
+    # scan whole chunks (writing & counting at once) rather than per line
+    read = getattr(fin, 'read1', None) or fin.read
+    if not callback_len:
+        buf = b''  # unterminated data
         while True:
-            tmp = fin.read(buf_size)
+            tmp = read(buf_size)
 
             # flush at EOF
             if not tmp:
+                if buf:
+                    callback([buf] if callback_pieces else buf)
                 getattr(fout, 'flush', lambda: None)()
                 return
 
             fp_write(tmp)
-            callback(len(tmp))
-        # return
+            data = (buf + tmp).split(delim)
+            buf = data.pop()
+            if callback_pieces:
+                if data:
+                    callback(data)
+            else:
+                for i in data:
+                    callback(i)
 
-    buf = b''
     len_delim = len(delim)
-    # n = 0
+    # `rfind` gives the last `split`-style match unless `delim` overlaps itself
+    overlaps = any(delim[:i] == delim[-i:] for i in range(1, len_delim))
+    tail = b''  # (multi-byte `delim`) end of data which may start a `delim`
+    partial = False  # data after the last `delim`
     while True:
-        tmp = fin.read(buf_size)
+        tmp = read(buf_size)
 
         # flush at EOF
         if not tmp:
-            if buf:
-                fp_write(buf)
-                if callback_len:
-                    # n += 1 + buf.count(delim)
-                    callback(1 + buf.count(delim))
-                else:
-                    for i in buf.split(delim):
-                        callback(i)
+            if partial:
+                callback(1)
             getattr(fout, 'flush', lambda: None)()
-            return  # n
+            return
 
-        while True:
-            i = tmp.find(delim)
-            if i < 0:
-                buf += tmp
-                break
-            fp_write(buf + tmp[:i + len(delim)])
-            # n += 1
-            callback(1 if callback_len else (buf + tmp[:i]))
-            buf = b''
-            tmp = tmp[i + len_delim:]
+        fp_write(tmp)
+        if len_delim == 1:
+            n = tmp.count(delim)
+            partial = not tmp.endswith(delim)
+        else:
+            data = tail + tmp
+            n = data.count(delim)
+            if overlaps:
+                rest = data.split(delim)[-1]
+            else:
+                end = data.rfind(delim)
+                rest = data[end + len_delim:] if end >= 0 else data
+            partial = bool(rest)
+            tail = rest[1 - len_delim:]
+        if n:
+            callback(n)
 
 
 # ((opt, type), ... )
@@ -127,8 +289,10 @@ CLI_EXTRA_DOC = r"""
         Delimiting character [default: '\n']. Use '\0' for null.
         N.B.: on Windows systems, Python converts '\n' to '\r\n'.
     buf_size  : int, optional
-        String buffer size in bytes [default: 256]
+        String buffer size in bytes [default: 65536]
         used when `delim` is specified.
+        With `bytes`, the default is 1 MiB, and data is copied with
+        `os.splice`/`os.sendfile` (without `tee`) where possible.
     bytes  : bool, optional
         If true, will count bytes, ignore `delim`, and default
         `unit_scale` to True, `unit_divisor` to 1024, and `unit` to 'B'.
@@ -136,12 +300,15 @@ CLI_EXTRA_DOC = r"""
         If true, passes `stdin` to both `stderr` and `stdout`.
     update  : bool, optional
         If true, will treat input as newly elapsed iterations,
-        i.e. numbers to pass to `update()`. Note that this is slow
-        (~2e5 it/s) since every input must be decoded as a number.
+        i.e. numbers to pass to `update()`. Numbers are parsed in bulk,
+        with one `update()` per `buf_size` chunk of input.
     update_to  : bool, optional
         If true, will treat input as total elapsed iterations,
-        i.e. numbers to assign to `self.n`. Note that this is slow
-        (~2e5 it/s) since every input must be decoded as a number.
+        i.e. numbers to assign to `self.n`. Only the last number in
+        each `buf_size` chunk of input is parsed.
+    binary  : bool, optional
+        If true (with `update` or `update_to`), will treat input as a
+        stream of little-endian signed 64-bit integers (ignoring `delim`).
     null  : bool, optional
         If true, will discard input (no stdout).
     manpath  : str, optional
@@ -153,6 +320,167 @@ CLI_EXTRA_DOC = r"""
 """
 
 
+# `{name: type}` parsed from `tqdm.__doc__ + CLI_EXTRA_DOC` by `parse_opts()`
+# (precomputed to avoid parsing on startup)
+OPT_TYPES = {
+    'desc': 'str', 'total': 'int or float', 'leave': 'bool', 'ncols': 'int',
+    'mininterval': 'float', 'maxinterval': 'float', 'miniters': 'int or float',
+    'ascii': 'bool or str', 'disable': 'bool', 'unit': 'str',
+    'unit_scale': 'bool or int or float', 'dynamic_ncols': 'bool', 'smoothing': 'float',
+    'bar_format': 'str', 'initial': 'int or float', 'position': 'int', 'postfix': 'dict or *',
+    'unit_divisor': 'float', 'write_bytes': 'bool', 'lock_args': 'tuple', 'nrows': 'int',
+    'colour': 'str', 'delay': 'float', 'background': 'bool', 'sharded': 'bool',
+    'clock': 'str or callable', 'predictive_miniters': 'bool', 'render_budget': 'float',
+    'stats': 'bool', 'histogram': 'bool', 'estimator': 'str or RateEstimator',
+    'jsonl': 'bool or float', 'stall_timeout': 'float',
+    'delim': 'chr', 'buf_size': 'int', 'bytes': 'bool', 'tee': 'bool', 'update': 'bool',
+    'update_to': 'bool', 'binary': 'bool', 'null': 'bool', 'manpath': 'str',
+    'comppath': 'str', 'log': 'str'}
+HELP_SHORT = ("Usage:\n  tqdm [--help | options]\n"
+              "  tqdm replay [--summary] [--speed=<speed>] <file>\n")
+
+
+def parse_opts():
+    """Returns `(opt_types, help)` parsed from `tqdm.__doc__ + CLI_EXTRA_DOC`."""
+    # py<3.13 doesn't dedent docstrings
+    d = (tqdm.__doc__ if sys.version_info < (3, 13)
+         else indent(tqdm.__doc__, "    ")) + CLI_EXTRA_DOC
+
+    opt_types = dict(RE_OPTS.findall(d))
+    # opt_types['delim'] = 'chr'
+
+    for o in UNSUPPORTED_OPTS:
+        opt_types.pop(o)
+
+    # d = RE_OPTS.sub(r'  --\1=<\1>  : \2', d)
+    split = RE_OPTS.split(d)
+    opt_types_desc = zip(split[1::3], split[2::3], split[3::3])
+    d = ''.join(('\n  --{0}  : {2}{3}' if otd[1] == 'bool' else
+                 '\n  --{0}=<{1}>  : {2}{3}').format(
+                     otd[0].replace('_', '-'), otd[0], *otd[1:])
+                for otd in opt_types_desc if otd[0] not in UNSUPPORTED_OPTS)
+
+    return opt_types, HELP_SHORT + """
+Options:
+  -h, --help     Print this help and exit.
+  -v, --version  Print version and exit.
+""" + d.strip('\n') + '\n'
+
+
+def summarise(records, fout, buckets=10):
+    """
+    Writes per-bar statistics (duration, final `n`/`total`, average rate,
+    longest stall, and rates over time) of `(time, bar_id, event, n, total)`
+    `records` (see `tqdm.contrib.trace.read_log`) to `fout`.
+    """
+    from .contrib.trace import DESC
+
+    bars, descs = {}, {}  # {bar_id: [(t, n, total), ...]}, {bar_id: desc}
+    for t, i, event, n, total in records:
+        if event == DESC:
+            descs[i] = n
+        else:
+            bars.setdefault(i, []).append((t, n, total))
+
+    def fmt(seconds):
+        return f"{seconds:.3g}s" if seconds < 60 else tqdm.format_interval(seconds)
+
+    def fmt_num(x):
+        return f"{x:.3g}" if x < 1e3 else tqdm.format_sizeof(x)
+
+    start_t = min(i[0][0] for i in bars.values()) if bars else 0
+    fout.write(f"{len(records)} records, {len(bars)} bars\n")
+    for i, samples in sorted(bars.items()):
+        t0, n0, _ = samples[0]
+        t1, n1, total = samples[-1]
+        duration = t1 - t0
+        # longest time without progress
+        stall, stall_t, last_t, last_n = 0, t0, t0, n0
+        for t, n, _ in samples:
+            if t - last_t > stall:
+                stall, stall_t = t - last_t, last_t
+            if n != last_n:
+                last_t, last_n = t, n
+        # rates over `buckets` equal periods
+        rates = [0] * buckets
+        width = duration / buckets
+        for (ta, na, _), (tb, nb, _) in zip(samples, samples[1:]):
+            if width and nb > na:
+                rates[min(int((tb - t0) / width), buckets - 1)] += (nb - na) / width
+        fout.write(
+            f"bar {i}{f' ({descs[i]})' if descs.get(i) else ''}:"
+            f" +{fmt(t0 - start_t)} for {fmt(duration)},"
+            f" n={n1:g}/{'?' if total is None else f'{total:g}'},"
+            f" {fmt_num((n1 - n0) / duration) if duration else '?'}it/s,"
+            f" longest stall {fmt(stall)} at +{fmt(stall_t - start_t)}\n"
+            f"  it/s over time: {' '.join(map(fmt_num, rates))}\n")
+
+
+def replay(argv, fp=sys.stderr):
+    """
+    `tqdm replay [--summary] [--speed=<speed>] <file>`: summarise or
+    re-render (at `speed` times real time, or instantly if 0) a log written
+    by `tqdm.contrib.trace.BinaryRecorder`.
+    """
+    from time import sleep
+
+    from .contrib.trace import CLOSE, DESC, RESET, START, read_log
+
+    opts, paths, argv = {}, [], list(argv)
+    while argv:
+        arg = argv.pop(0)
+        if arg == '--summary':
+            opts['summary'] = True
+        elif arg == '--speed' and argv:
+            opts['speed'] = argv.pop(0)
+        elif arg.startswith('--speed='):
+            opts['speed'] = arg[len('--speed='):]
+        elif arg.startswith('-'):
+            paths = []
+            break
+        else:
+            paths.append(arg)
+    if len(paths) != 1:
+        raise TqdmKeyError("Usage:\n  tqdm replay [--summary] [--speed=<speed>] <file>")
+    records = read_log(paths[0])
+    if opts.get('summary'):
+        return summarise(records, sys.stdout)
+
+    speed = cast(opts.get('speed', '1'), 'float')
+    clock = {'t': records[0][0] if records else 0}
+    bars, descs = {}, {}
+    for _, i, event, desc, _ in records:
+        if event == DESC:
+            descs.setdefault(i, desc)
+    try:
+        for t, i, event, n, total in records:
+            if event == DESC:
+                if i in bars:
+                    bars[i].set_description_str(n, refresh=False)
+                continue
+            n = int(n) if n.is_integer() else n
+            total = int(total) if total is not None and total.is_integer() else total
+            if speed and t > clock['t']:
+                sleep((t - clock['t']) / speed)
+            clock['t'] = t
+            bar = bars.get(i)
+            if bar is None:
+                bar = bars[i] = tqdm(total=total, initial=n, desc=descs.get(i) or f"bar {i}",
+                                     file=fp, clock=lambda: clock['t'], mininterval=0)
+                if event == START:
+                    continue
+            if event == RESET:
+                bar.reset(total=total)
+                continue
+            bar.total = total
+            bar.update(n - bar.n)
+            if event == CLOSE:
+                bar.close()
+    finally:
+        for bar in bars.values():
+            bar.close()
+
+
 def main(fp=sys.stderr, argv=None):
     """
     Parameters (internal use only)
@@ -162,6 +490,8 @@ def main(fp=sys.stderr, argv=None):
     """
     if argv is None:
         argv = sys.argv[1:]
+    if argv[:1] == ['replay']:
+        return replay(argv[1:], fp=fp)
     try:
         log_idx = argv.index('--log')
     except ValueError:
@@ -178,42 +508,19 @@ def main(fp=sys.stderr, argv=None):
     logging.basicConfig(level=getattr(logging, logLevel),
                         format="%(levelname)s:%(module)s:%(lineno)d:%(message)s")
 
-    # py<3.13 doesn't dedent docstrings
-    d = (tqdm.__doc__ if sys.version_info < (3, 13)
-         else indent(tqdm.__doc__, "    ")) + CLI_EXTRA_DOC
-
-    opt_types = dict(RE_OPTS.findall(d))
-    # opt_types['delim'] = 'chr'
-
-    for o in UNSUPPORTED_OPTS:
-        opt_types.pop(o)
-
+    opt_types = OPT_TYPES
     log.debug(sorted(opt_types.items()))
 
-    # d = RE_OPTS.sub(r'  --\1=<\1>  : \2', d)
-    split = RE_OPTS.split(d)
-    opt_types_desc = zip(split[1::3], split[2::3], split[3::3])
-    d = ''.join(('\n  --{0}  : {2}{3}' if otd[1] == 'bool' else
-                 '\n  --{0}=<{1}>  : {2}{3}').format(
-                     otd[0].replace('_', '-'), otd[0], *otd[1:])
-                for otd in opt_types_desc if otd[0] not in UNSUPPORTED_OPTS)
-
-    help_short = "Usage:\n  tqdm [--help | options]\n"
-    d = help_short + """
-Options:
-  -h, --help     Print this help and exit.
-  -v, --version  Print version and exit.
-""" + d.strip('\n') + '\n'
-
     # opts = docopt(d, version=__version__)
     if any(v in argv for v in ('-v', '--version')):
+        from .version import __version__  # slow import
         sys.stdout.write(__version__ + '\n')
         sys.exit(0)
     elif any(v in argv for v in ('-h', '--help')):
-        sys.stdout.write(d + '\n')
+        sys.stdout.write(parse_opts()[1] + '\n')
         sys.exit(0)
     elif argv and argv[0][:2] != '--':
-        sys.stderr.write(f"Error:Unknown argument:{argv[0]}\n{help_short}")
+        sys.stderr.write(f"Error:Unknown argument:{argv[0]}\n{HELP_SHORT}")
 
     argv = RE_SHLEX.split(' '.join(["tqdm"] + argv))
     opts = dict(zip(argv[1::3], argv[3::3]))
@@ -234,16 +541,19 @@ Options:
         delim_per_char = tqdm_args.pop('bytes', False)
         update = tqdm_args.pop('update', False)
         update_to = tqdm_args.pop('update_to', False)
+        binary = tqdm_args.pop('binary', False)
         if sum((delim_per_char, update, update_to)) > 1:
             raise TqdmKeyError("Can only have one of --bytes --update --update_to")
+        if binary and not (update or update_to):
+            raise TqdmKeyError("--binary requires --update or --update_to")
     except Exception:
-        fp.write("\nError:\n" + help_short)
+        fp.write("\nError:\n" + HELP_SHORT)
         stdin, stdout_write = sys.stdin, sys.stdout.write
         for i in stdin:
             stdout_write(i)
         raise
     else:
-        buf_size = tqdm_args.pop('buf_size', 256)
+        buf_size = tqdm_args.pop('buf_size', None)
         delim = tqdm_args.pop('delim', b'\\n')
         tee = tqdm_args.pop('tee', False)
         manpath = tqdm_args.pop('manpath', None)
@@ -290,35 +600,47 @@ Options:
             tqdm_args.setdefault('unit_divisor', 1024)
             log.debug(tqdm_args)
             with tqdm(**tqdm_args) as t:
-                posix_pipe(stdin, stdout, '', buf_size, t.update)
+                posix_pipe(stdin, stdout, '', buf_size or 2 ** 20, t.update,
+                           zero_copy=not tee)
+        elif binary:
+            log.debug(tqdm_args)
+            with tqdm(**tqdm_args) as t:
+                if update:
+                    def callback(numbers):
+                        t.update(sum(numbers))
+                else:  # update_to
+                    def callback(numbers):
+                        t.update(numbers[-1] - t.n)
+                binary_pipe(stdin, stdout, buf_size or 2 ** 16, callback)
         elif delim == b'\\n':
             log.debug(tqdm_args)
             write = stdout.write
-            if update or update_to:
+            if (update or update_to) and hasattr(stdin, 'read'):
+                with tqdm(**tqdm_args) as t:
+                    posix_pipe(stdin, stdout, b'\n', buf_size or 2 ** 16,
+                               update_callback(t, update_to), False, callback_pieces=True)
+            elif update or update_to:
                 with tqdm(**tqdm_args) as t:
                     if update:
                         def callback(i):
-                            t.update(literal_eval(i.decode()))
+                            t.update(number(i))
                     else:  # update_to
                         def callback(i):
-                            t.update(literal_eval(i.decode()) - t.n)
+                            t.update(number(i) - t.n)
                     for i in stdin:
                         write(i)
                         callback(i)
+            elif hasattr(stdin, 'read'):
+                with tqdm(**tqdm_args) as t:
+                    posix_pipe(stdin, stdout, b'\n', buf_size or 2 ** 16, t.update)
             else:
                 for i in tqdm(stdin, **tqdm_args):
                     write(i)
         else:
             log.debug(tqdm_args)
             with tqdm(**tqdm_args) as t:
-                callback_len = False
-                if update:
-                    def callback(i):
-                        t.update(literal_eval(i.decode()))
-                elif update_to:
-                    def callback(i):
-                        t.update(literal_eval(i.decode()) - t.n)
+                if update or update_to:
+                    posix_pipe(stdin, stdout, delim, buf_size or 2 ** 16,
+                               update_callback(t, update_to), False, callback_pieces=True)
                 else:
-                    callback = t.update
-                    callback_len = True
-                posix_pipe(stdin, stdout, delim, buf_size, callback, callback_len)
+                    posix_pipe(stdin, stdout, delim, buf_size or 2 ** 16, t.update)
@@ -5,14 +5,14 @@ _tqdm(){
   prv="${COMP_WORDS[COMP_CWORD - 1]}"
 
   case ${prv} in
-  --bar_format|--buf_size|--colour|--comppath|--delay|--delim|--desc|--initial|--lock_args|--manpath|--maxinterval|--mininterval|--miniters|--ncols|--nrows|--position|--postfix|--smoothing|--total|--unit|--unit_divisor)
+  --bar_format|--buf_size|--clock|--colour|--comppath|--delay|--delim|--desc|--estimator|--initial|--lock_args|--manpath|--maxinterval|--mininterval|--miniters|--ncols|--nrows|--position|--postfix|--render_budget|--smoothing|--stall_timeout|--total|--unit|--unit_divisor)
     # await user input
     ;;
   "--log")
     COMPREPLY=($(compgen -W       'CRITICAL FATAL ERROR WARN WARNING INFO DEBUG NOTSET' -- ${cur}))
     ;;
   *)
-    COMPREPLY=($(compgen -W '--ascii --bar_format --buf_size --bytes --colour --comppath --delay --delim --desc --disable --dynamic_ncols --help --initial --leave --lock_args --log --manpath --maxinterval --mininterval --miniters --ncols --nrows --null --position --postfix --smoothing --tee --total --unit --unit_divisor --unit_scale --update --update_to --version --write_bytes -h -v' -- ${cur}))
+    COMPREPLY=($(compgen -W '--ascii --background --bar_format --binary --buf_size --bytes --clock --colour --comppath --delay --delim --desc --disable --dynamic_ncols --estimator --help --histogram --initial --jsonl --leave --lock_args --log --manpath --maxinterval --mininterval --miniters --ncols --nrows --null --position --postfix --predictive_miniters --render_budget --sharded --smoothing --stall_timeout --stats --tee --total --unit --unit_divisor --unit_scale --update --update_to --version --write_bytes -h -v' -- ${cur}))
     ;;
   esac
 }
@@ -1,15 +1,21 @@
 """
 Thin wrappers around `concurrent.futures`.
 """
-from contextlib import contextmanager
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from itertools import islice
 from operator import length_hint
 from os import cpu_count
+from threading import Event, Thread, local
+from time import perf_counter
 
 from ..auto import tqdm as tqdm_auto
-from ..std import TqdmWarning
+from ..std import EMA, TqdmWarning
 
 __author__ = {"github.com/": ["casperdcl"]}
-__all__ = ['thread_map', 'process_map']
+__all__ = ['thread_map', 'process_map', 'thread_imap', 'process_imap', 'update_progress']
+# `.counts`, `.slot` in (each thread of) `*_map(shared_progress=True)` workers
+_worker_progress = local()
 
 
 @contextmanager
@@ -19,11 +25,71 @@ def ensure_lock(tqdm_class, lock_name=""):
     lock = old_lock or tqdm_class.get_lock()  # maybe create a new lock
     lock = getattr(lock, lock_name, lock)  # maybe subtype
     tqdm_class.set_lock(lock)
-    yield lock
-    if old_lock is None:
-        del tqdm_class._lock
-    else:
-        tqdm_class.set_lock(old_lock)
+    try:
+        yield lock
+    finally:  # even if e.g. an `*_imap` generator is closed early
+        if old_lock is None:
+            del tqdm_class._lock
+        else:
+            tqdm_class.set_lock(old_lock)
+
+
+@contextmanager
+def _poll_progress(t, counts, interval):
+    """advance `t` by `sum(counts)` every `interval` seconds (in a thread)"""
+    done = Event()
+    last = [0]  # previously polled `sum(counts)` (`t.n` may include `initial`)
+
+    def advance():
+        s = sum(counts)
+        t.update(s - last[0])
+        last[0] = s
+
+    def poll():
+        while not done.wait(interval):
+            advance()
+
+    poller = Thread(target=poll, name="tqdm_shared_progress", daemon=True)
+    poller.start()
+    try:
+        yield
+    finally:
+        done.set()
+        poller.join()
+        advance()
+
+
+def _shared_counts(max_workers):
+    """`(counts, slots)` for `shared_progress`"""
+    from multiprocessing import RawArray, Value
+
+    # one counter per worker, so no locking is needed to increment
+    return RawArray('q', max_workers), Value('i', 0)
+
+
+def update_progress(n=1):
+    """
+    Advance the bar of `process_map(..., shared_progress=True)` (or `thread_map`)
+    from within its workers (no-op elsewhere).
+
+    Parameters
+    ----------
+    n  : int, optional
+        Increment to add to this worker's (shared memory) counter [default: 1].
+    """
+    counts = getattr(_worker_progress, 'counts', None)
+    if counts is not None:
+        counts[_worker_progress.slot] += n
+
+
+def _init_worker(set_lock, lock, counts=None, slots=None):
+    """share `lock` and claim a slot of `counts` (if any)"""
+    set_lock(lock)
+    if counts is not None:
+        with slots.get_lock():
+            _worker_progress.slot = slots.value
+            slots.value += 1
+        _worker_progress.counts = counts
 
 
 def _executor_map(PoolExecutor, fn, *iterables, **tqdm_kwargs):
@@ -36,6 +102,7 @@ def _executor_map(PoolExecutor, fn, *iterables, **tqdm_kwargs):
     max_workers  : [default: min(32, cpu_count() + 4)].
     chunksize  : [default: 1].
     lock_name  : [default: "":str].
+    shared_progress  : [default: False].
     """
     kwargs = tqdm_kwargs.copy()
     if "total" not in kwargs:
@@ -43,12 +110,140 @@ def _executor_map(PoolExecutor, fn, *iterables, **tqdm_kwargs):
     tqdm_class = kwargs.pop("tqdm_class", tqdm_auto)
     max_workers = kwargs.pop("max_workers", min(32, cpu_count() + 4))
     chunksize = kwargs.pop("chunksize", 1)
+    if chunksize == "auto":
+        return list(_executor_imap(PoolExecutor, fn, *iterables, **tqdm_kwargs))
     lock_name = kwargs.pop("lock_name", "")
+    counts = slots = None
+    if kwargs.pop("shared_progress", False):
+        counts, slots = _shared_counts(max_workers)
     with ensure_lock(tqdm_class, lock_name=lock_name) as lk:
         # share lock in case workers are already using `tqdm`
-        with PoolExecutor(max_workers=max_workers, initializer=tqdm_class.set_lock,
-                          initargs=(lk,)) as ex:
-            return list(tqdm_class(ex.map(fn, *iterables, chunksize=chunksize), **kwargs))
+        with PoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                          initargs=(tqdm_class.set_lock, lk, counts, slots)) as ex:
+            if counts is None:
+                return list(tqdm_class(ex.map(fn, *iterables, chunksize=chunksize), **kwargs))
+            with tqdm_class(**kwargs) as t, _poll_progress(
+                    t, counts, getattr(tqdm_class, 'render_interval', 0.1)):
+                return list(ex.map(fn, *iterables, chunksize=chunksize))
+
+
+def _apply_chunk(fn, chunk):
+    """`[fn(*args) for args in chunk]`"""
+    return [fn(*args) for args in chunk]
+
+
+def _apply_chunk_timed(fn, chunk):
+    """`(_apply_chunk(fn, chunk), elapsed_seconds)`"""
+    start_t = perf_counter()
+    res = [fn(*args) for args in chunk]
+    return res, perf_counter() - start_t
+
+
+def _executor_imap(PoolExecutor, fn, *iterables, **tqdm_kwargs):
+    """
+    Implementation of `thread_imap` and `process_imap`.
+
+    Parameters
+    ----------
+    tqdm_class  : [default: tqdm.auto.tqdm].
+    max_workers  : [default: min(32, cpu_count() + 4)].
+    chunksize  : [default: 1].
+    lock_name  : [default: "":str].
+    chunk_duration  : [default: 0.2].
+    window  : [default: 2 * max_workers].
+    ordered  : [default: True].
+    shared_progress  : [default: False].
+    """
+    from concurrent.futures import FIRST_COMPLETED, wait
+
+    kwargs = tqdm_kwargs.copy()
+    if "total" not in kwargs:
+        kwargs["total"] = length_hint(iterables[0])
+    tqdm_class = kwargs.pop("tqdm_class", tqdm_auto)
+    max_workers = kwargs.pop("max_workers", min(32, cpu_count() + 4))
+    chunksize = kwargs.pop("chunksize", 1)
+    lock_name = kwargs.pop("lock_name", "")
+    chunk_duration = kwargs.pop("chunk_duration", 0.2)
+    window = kwargs.pop("window", None) or 2 * max_workers
+    ordered = kwargs.pop("ordered", True)
+    counts = slots = None
+    if kwargs.pop("shared_progress", False):
+        counts, slots = _shared_counts(max_workers)
+    items = zip(*iterables)
+    auto = chunksize == "auto"
+    if auto:
+        # start small to sample per-item cost, then aim for `chunk_duration` per task
+        chunksize, item_t, remaining = 1, EMA(), kwargs["total"] or 0
+    with ensure_lock(tqdm_class, lock_name=lock_name) as lk:
+        # share lock in case workers are already using `tqdm`
+        with PoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                          initargs=(tqdm_class.set_lock, lk, counts, slots)) as ex, \
+                tqdm_class(**kwargs) as t, (
+                    nullcontext() if counts is None else _poll_progress(
+                        t, counts, getattr(tqdm_class, 'render_interval', 0.1))):
+            pending = deque() if ordered else set()
+            submit = pending.append if ordered else pending.add
+
+            def fill():
+                # keep at most `window` chunks in flight
+                while len(pending) < window:
+                    chunk = list(islice(items, chunksize))
+                    if not chunk:
+                        break
+                    submit(ex.submit(_apply_chunk_timed if auto else _apply_chunk, fn, chunk))
+
+            try:
+                fill()
+                while pending:
+                    if ordered:
+                        done = (pending.popleft(),)
+                    else:
+                        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                        pending -= done
+                    for future in done:
+                        res = future.result()
+                        if auto:
+                            res, dt = res
+                            item_t(dt / len(res))
+                            remaining -= len(res)
+                            size = chunk_duration / item_t() if item_t() else 2 * chunksize
+                            # limit growth, and keep all workers busy until the end
+                            size = min(size, 2 * chunksize)
+                            if remaining > 0:
+                                size = min(size, remaining / max_workers)
+                            chunksize = max(1, int(size))
+                        if counts is None:
+                            t.update(len(res))
+                        yield from res
+                    fill()
+            finally:
+                # e.g. if the consumer stopped early
+                for future in pending:
+                    future.cancel()
+
+
+def _warn_chunksize(iterables, tqdm_kwargs):
+    """warn if `process_*map` would use `chunksize=1` for large iterables"""
+    if iterables and "chunksize" not in tqdm_kwargs:
+        # default `chunksize=1` has poor performance for large iterables
+        # (most time spent dispatching items to workers).
+        longest_iterable_len = max(map(length_hint, iterables))
+        if longest_iterable_len > 1000:
+            from warnings import warn
+            warn("Iterable length %d > 1000 but `chunksize` is not set."
+                 " This may seriously degrade multiprocess performance."
+                 " Set `chunksize=1` or more (or `chunksize='auto'`)."
+                 % longest_iterable_len,
+                 TqdmWarning, stacklevel=4)
+
+
+def _process_kwargs(iterables, tqdm_kwargs):
+    """`tqdm_kwargs` with `process_*map` defaults (`lock_name="mp_lock"`)"""
+    _warn_chunksize(iterables, tqdm_kwargs)
+    if "lock_name" not in tqdm_kwargs:
+        tqdm_kwargs = tqdm_kwargs.copy()
+        tqdm_kwargs["lock_name"] = "mp_lock"
+    return tqdm_kwargs
 
 
 def thread_map(fn, *iterables, **tqdm_kwargs):
@@ -64,6 +259,9 @@ def thread_map(fn, *iterables, **tqdm_kwargs):
         Maximum number of workers to spawn; passed to
         `concurrent.futures.ThreadPoolExecutor.__init__`.
         [default: max(32, cpu_count() + 4)].
+    shared_progress  : bool, optional
+        If set, `fn` should call `update_progress()` to advance the bar
+        [default: False]. See `process_map`.
     """
     from concurrent.futures import ThreadPoolExecutor
     return _executor_map(ThreadPoolExecutor, fn, *iterables, **tqdm_kwargs)
@@ -82,24 +280,85 @@ def process_map(fn, *iterables, **tqdm_kwargs):
         Maximum number of workers to spawn; passed to
         `concurrent.futures.ProcessPoolExecutor.__init__`.
         [default: min(32, cpu_count() + 4)].
-    chunksize  : int, optional
+    chunksize  : int or str, optional
         Size of chunks sent to worker processes; passed to
         `concurrent.futures.ProcessPoolExecutor.map`. [default: 1].
+        If "auto", adapts the size of each chunk to take about
+        `chunk_duration` seconds, based on the measured time per item.
+    chunk_duration  : float, optional
+        Target chunk processing time for `chunksize="auto"` [default: 0.2].
     lock_name  : str, optional
         Member of `tqdm_class.get_lock()` to use [default: mp_lock].
+    shared_progress  : bool, optional
+        If set, `fn` should call `update_progress()` to advance the bar
+        (rather than the bar advancing once per result), which increments
+        a per-worker counter in shared memory [default: False].
+        Useful for smooth progress within long-running or chunked tasks.
+        Note that `total` should be specified in the same units.
     """
     from concurrent.futures import ProcessPoolExecutor
-    if iterables and "chunksize" not in tqdm_kwargs:
-        # default `chunksize=1` has poor performance for large iterables
-        # (most time spent dispatching items to workers).
-        longest_iterable_len = max(map(length_hint, iterables))
-        if longest_iterable_len > 1000:
-            from warnings import warn
-            warn("Iterable length %d > 1000 but `chunksize` is not set."
-                 " This may seriously degrade multiprocess performance."
-                 " Set `chunksize=1` or more." % longest_iterable_len,
-                 TqdmWarning, stacklevel=2)
-    if "lock_name" not in tqdm_kwargs:
-        tqdm_kwargs = tqdm_kwargs.copy()
-        tqdm_kwargs["lock_name"] = "mp_lock"
+    tqdm_kwargs = _process_kwargs(iterables, tqdm_kwargs)
     return _executor_map(ProcessPoolExecutor, fn, *iterables, **tqdm_kwargs)
+
+
+def thread_imap(fn, *iterables, **tqdm_kwargs):
+    """
+    Equivalent of `map(fn, *iterables)`
+    driven by `concurrent.futures.ThreadPoolExecutor`,
+    consuming `iterables` lazily (with bounded memory).
+
+    Parameters
+    ----------
+    tqdm_class  : optional
+        `tqdm` class to use for bars [default: tqdm.auto.tqdm].
+    max_workers  : int, optional
+        Maximum number of workers to spawn; passed to
+        `concurrent.futures.ThreadPoolExecutor.__init__`.
+        [default: max(32, cpu_count() + 4)].
+    chunksize  : int or str, optional
+        Number of items per task [default: 1].
+        If "auto", adapts the size of each chunk to take about
+        `chunk_duration` seconds, based on the measured time per item.
+    chunk_duration  : float, optional
+        Target chunk processing time for `chunksize="auto"` [default: 0.2].
+    window  : int, optional
+        Maximum number of tasks in flight [default: 2 * max_workers].
+    ordered  : bool, optional
+        If set [default: True], yields results in input order.
+        Otherwise yields them as soon as they complete.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    return _executor_imap(ThreadPoolExecutor, fn, *iterables, **tqdm_kwargs)
+
+
+def process_imap(fn, *iterables, **tqdm_kwargs):
+    """
+    Equivalent of `map(fn, *iterables)`
+    driven by `concurrent.futures.ProcessPoolExecutor`,
+    consuming `iterables` lazily (with bounded memory).
+
+    Parameters
+    ----------
+    tqdm_class  : optional
+        `tqdm` class to use for bars [default: tqdm.auto.tqdm].
+    max_workers  : int, optional
+        Maximum number of workers to spawn; passed to
+        `concurrent.futures.ProcessPoolExecutor.__init__`.
+        [default: min(32, cpu_count() + 4)].
+    chunksize  : int or str, optional
+        Number of items per task sent to worker processes [default: 1].
+        If "auto", adapts the size of each chunk to take about
+        `chunk_duration` seconds, based on the measured time per item.
+    chunk_duration  : float, optional
+        Target chunk processing time for `chunksize="auto"` [default: 0.2].
+    window  : int, optional
+        Maximum number of tasks in flight [default: 2 * max_workers].
+    ordered  : bool, optional
+        If set [default: True], yields results in input order.
+        Otherwise yields them as soon as they complete.
+    lock_name  : str, optional
+        Member of `tqdm_class.get_lock()` to use [default: mp_lock].
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    tqdm_kwargs = _process_kwargs(iterables, tqdm_kwargs)
+    return _executor_imap(ProcessPoolExecutor, fn, *iterables, **tqdm_kwargs)
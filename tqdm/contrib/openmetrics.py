@@ -0,0 +1,122 @@
+"""
+Exports live bars as [OpenMetrics](https://openmetrics.io) (Prometheus)
+metrics, snapshotted at scrape time (so updates are not slowed down).
+
+Usage:
+>>> from tqdm import trange
+>>> from tqdm.contrib.openmetrics import start_http_server
+>>> server = start_http_server(9090)  # serves http://localhost:9090/metrics
+>>> for i in trange(10):
+...     ...
+>>> server.shutdown()
+
+Or for the node exporter's textfile collector:
+>>> from tqdm.contrib.openmetrics import write_textfile
+>>> write_textfile("/var/lib/node_exporter/tqdm.prom")
+"""
+import os
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+
+from ..std import tqdm as std_tqdm
+
+__author__ = {"github.com/": ["casperdcl"]}
+__all__ = ['CONTENT_TYPE', 'snapshot', 'generate_latest', 'write_textfile', 'start_http_server']
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+# (name, type, unit, help)
+METRICS = (
+    ("tqdm_n", "counter", "", "Iterations completed"),
+    ("tqdm_total", "gauge", "", "Expected total iterations"),
+    ("tqdm_rate", "gauge", "", "Iterations per second"),
+    ("tqdm_elapsed_seconds", "gauge", "seconds", "Time since start"),
+    ("tqdm_remaining_seconds", "gauge", "seconds", "Estimated time to completion"))
+
+
+def _escape(label):
+    return str(label).replace('\\', r'\\').replace('\n', r'\n').replace('"', r'\"')
+
+
+def snapshot(tqdm_class=std_tqdm):
+    """
+    Returns `[(labels, {metric: value}), ...]` for all live bars of
+    `tqdm_class` (default: all bars).
+    """
+    res = []
+    with tqdm_class.get_lock():
+        for inst in list(tqdm_class._instances):
+            if inst.disable or not hasattr(inst, 'start_t'):
+                continue
+            d = inst.format_dict
+            n, total, elapsed, rate = d['n'], d['total'], d['elapsed'], d['rate']
+            if rate is None and elapsed:
+                rate = (n - d['initial']) / elapsed
+            remaining = (total - n) / rate if rate and total else None
+            res.append(({'desc': d['prefix'] or '', 'unit': d['unit'], 'position': abs(inst.pos)},
+                        {'tqdm_n': n, 'tqdm_total': total, 'tqdm_rate': rate,
+                         'tqdm_elapsed_seconds': elapsed, 'tqdm_remaining_seconds': remaining}))
+    return res
+
+
+def generate_latest(tqdm_class=std_tqdm):
+    """Returns the OpenMetrics text exposition of all live bars of `tqdm_class`."""
+    bars = snapshot(tqdm_class)
+    lines = []
+    for name, typ, unit, help_ in METRICS:
+        lines.append(f"# TYPE {name} {typ}")
+        if unit:
+            lines.append(f"# UNIT {name} {unit}")
+        lines.append(f"# HELP {name} {help_}.")
+        sample = name + "_total" if typ == "counter" else name
+        for labels, values in bars:
+            if values[name] is not None:
+                labels = ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items())
+                lines.append(f"{sample}{{{labels}}} {float(values[name])!r}")
+    lines.append("# EOF\n")
+    return "\n".join(lines)
+
+
+def write_textfile(path, tqdm_class=std_tqdm):
+    """
+    Atomically writes `generate_latest(tqdm_class)` to `path`
+    (e.g. for the node exporter's textfile collector).
+    """
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as fd:
+        fd.write(generate_latest(tqdm_class))
+    os.replace(tmp, path)
+
+
+def start_http_server(port=0, addr="127.0.0.1", tqdm_class=std_tqdm):
+    """
+    Serves `generate_latest(tqdm_class)` from a daemon thread.
+
+    Parameters
+    ----------
+    port  : int, optional
+        Port to listen on [default: 0, i.e. any free port,
+        see `server.server_address`].
+    addr  : str, optional
+        Address to listen on [default: "127.0.0.1"].
+
+    Returns
+    -------
+    out  : http.server.ThreadingHTTPServer
+        Call `shutdown()` to stop serving.
+    """
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):  # pylint: disable=invalid-name
+            body = generate_latest(tqdm_class).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *_, **__):
+            pass
+
+    server = ThreadingHTTPServer((addr, port), Handler)
+    server.daemon_threads = True
+    Thread(target=server.serve_forever, name="tqdm_openmetrics", daemon=True).start()
+    return server
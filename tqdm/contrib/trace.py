@@ -0,0 +1,295 @@
+"""
+Records bars' lifetimes and progress samples, e.g. as a
+[Chrome trace](https://docs.google.com/document/d/1CvAClvFfyA5R-PhYUmn5OOQtYMH4h6I0nSsKchNAySU)
+viewable in <https://ui.perfetto.dev> or `chrome://tracing`.
+
+Usage:
+>>> from tqdm.contrib.trace import ChromeTraceRecorder, tqdm, trange
+>>> with ChromeTraceRecorder("trace.json") as recorder:
+...     for i in trange(10, recorder=recorder):
+...         for j in trange(100, recorder=recorder, leave=False):
+...             ...
+
+Or as a compact binary log, to replay/summarise with `tqdm replay <file>`:
+>>> from tqdm.contrib.trace import BinaryRecorder
+>>> with BinaryRecorder("progress.log") as recorder:
+...     for i in trange(10, recorder=recorder):
+...         ...
+"""
+import os
+from itertools import count
+from json import dumps
+from math import isnan, nan
+from struct import Struct
+from threading import Lock
+from time import perf_counter, time
+
+from ..auto import tqdm as tqdm_auto
+
+__author__ = {"github.com/": ["casperdcl"]}
+__all__ = ['Recorder', 'ChromeTraceRecorder', 'BinaryRecorder', 'read_log',
+           'tqdm_trace', 'ttrange', 'tqdm', 'trange']
+
+MAGIC = b"TQDMLOG1"
+# (time, bar_id, event, n, total): seconds since epoch, `trace_id`, `EVENTS` index,
+# `n`, `total` (`nan` if unknown).
+# `DESC` records are followed by `n` bytes of UTF-8 `desc`, padded to `RECORD.size`.
+RECORD = Struct("<dIIdd")
+EVENTS = ("sample", "start", "reset", "close", "desc")
+SAMPLE, START, RESET, CLOSE, DESC = range(len(EVENTS))
+
+
+class Recorder:
+    """
+    Base class for recording events of `tqdm_trace` bars.
+    Each bar is assigned a unique `bar.trace_id` on `start()`.
+    Methods may be called from multiple threads.
+    """
+    def __init__(self):
+        self._ids = count(1)
+        self.start_t = perf_counter()
+
+    def time(self):
+        """Returns seconds since this recorder was created."""
+        return perf_counter() - self.start_t
+
+    def start(self, bar):
+        """Called once `bar` is initialised."""
+        bar.trace_id = next(self._ids)
+
+    def sample(self, bar, format_dict):
+        """Called whenever `bar` is rendered."""
+
+    def reset(self, bar):
+        """Called after `bar.reset()`."""
+
+    def close(self, bar):
+        """Called after `bar.close()`."""
+
+    def flush(self):
+        """Finishes writing pending records."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.flush()
+
+
+class ChromeTraceRecorder(Recorder):
+    """
+    Writes Chrome Trace Event JSON: one span (thread track, sorted by
+    position) per bar, plus a counter track (`n`, `rate`) per bar.
+    Events are written incrementally (a truncated file can still be loaded).
+
+    Parameters
+    ----------
+    file  : str or file-like
+        Output path or (text) file.
+    """
+    def __init__(self, file):
+        super().__init__()
+        self._own = isinstance(file, (str, os.PathLike))
+        self.fp = open(file, "w", encoding="utf-8") if self._own else file
+        self.pid = os.getpid()
+        self._lock = Lock()
+        self._sep = "[\n"  # None once `flush()`ed
+
+    def event(self, bar, ph, **kwargs):
+        """Writes a trace event of type `ph` on the track of `bar`."""
+        event = {'ph': ph, 'pid': self.pid, 'tid': bar.trace_id,
+                 'ts': round(self.time() * 1e6, 3), **kwargs}
+        with self._lock:
+            if self._sep is not None:
+                self.fp.write(self._sep + dumps(event))
+                self._sep = ",\n"
+
+    def start(self, bar):
+        super().start(bar)
+        name = bar.desc or f"tqdm {bar.trace_id}"
+        self.event(bar, "M", name="thread_name", args={'name': name})
+        self.event(bar, "M", name="thread_sort_index", args={'sort_index': abs(bar.pos)})
+        self.event(bar, "B", name=name, args={'total': bar.total, 'unit': bar.unit})
+
+    def sample(self, bar, format_dict):
+        args = {'n': format_dict['n']}
+        if format_dict['rate'] is not None:
+            args['rate'] = format_dict['rate']
+        self.event(bar, "C", name=bar.desc or "tqdm", id=bar.trace_id, args=args)
+
+    def reset(self, bar):
+        self.event(bar, "i", name="reset", s="t", args={'total': bar.total})
+
+    def close(self, bar):
+        self.event(bar, "E", args={'n': bar.n})
+        with self._lock:
+            if self._sep is not None:
+                self.fp.flush()
+
+    def flush(self):
+        """Terminates the JSON array (and closes `file` if a path was given)."""
+        with self._lock:
+            if self._sep is None:
+                return
+            if self._sep == "[\n":  # no events
+                self.fp.write(self._sep)
+            self.fp.write("\n]\n")
+            self._sep = None
+            if self._own:
+                self.fp.close()
+            else:
+                self.fp.flush()
+
+
+class BinaryRecorder(Recorder):
+    """
+    Writes fixed-size (32 byte) binary records `(time, bar_id, event, n, total)`
+    (see `RECORD`) on every render and lifecycle event, as well as each
+    bar's `desc` (when it changes).
+    Read with `read_log()`, or summarise/replay with `tqdm replay <file>`.
+
+    Parameters
+    ----------
+    file  : str or file-like
+        Output path (appended to) or (binary) file.
+    """
+    def __init__(self, file):
+        super().__init__()
+        self._own = isinstance(file, (str, os.PathLike))
+        self.fp = open(file, "ab") if self._own else file
+        self._lock = Lock()
+        if self.fp.tell() == 0:
+            self.fp.write(MAGIC)
+        elif self._own:  # continue `bar_id`s of previous runs
+            self._ids = count(1 + max((i for _, i, _, _, _ in read_log(file)), default=0))
+
+    def record(self, bar, event, n=None, total=None):
+        """Writes a record of `event` (e.g. `SAMPLE`) for `bar`."""
+        total = bar.total if total is None else total
+        data = RECORD.pack(time(), bar.trace_id, event, bar.n if n is None else n,
+                           nan if total is None else total)
+        with self._lock:
+            if not self.fp.closed:
+                self.fp.write(data)
+
+    def record_desc(self, bar):
+        """Writes a `DESC` record (and the `desc`) of `bar`."""
+        bar.trace_desc = bar.desc
+        desc = bar.desc.encode("utf-8")
+        data = (RECORD.pack(time(), bar.trace_id, DESC, len(desc), nan) + desc
+                + b"\0" * (-len(desc) % RECORD.size))
+        with self._lock:
+            if not self.fp.closed:
+                self.fp.write(data)
+
+    def start(self, bar):
+        super().start(bar)
+        self.record(bar, START)
+        if bar.desc:
+            self.record_desc(bar)
+
+    def sample(self, bar, format_dict):
+        if bar.desc != getattr(bar, 'trace_desc', ""):
+            self.record_desc(bar)
+        self.record(bar, SAMPLE, format_dict['n'], format_dict['total'])
+
+    def reset(self, bar):
+        self.record(bar, RESET)
+
+    def close(self, bar):
+        self.record(bar, CLOSE)
+
+    def flush(self):
+        """Flushes (and closes `file` if a path was given)."""
+        with self._lock:
+            if self._own:
+                self.fp.close()
+            elif not self.fp.closed:
+                self.fp.flush()
+
+
+def read_log(file):
+    """
+    Returns a list of `(time, bar_id, event, n, total)` records written by
+    `BinaryRecorder` to `file` (path or binary file-like).
+    `total` is `None` if unknown. For `DESC` records, `n` is the `desc`.
+    A truncated trailing record is ignored.
+    """
+    if isinstance(file, (str, os.PathLike)):
+        with open(file, "rb") as fd:
+            data = fd.read()
+    else:
+        data = file.read()
+    if data[:len(MAGIC)] != MAGIC:
+        raise ValueError("Not a tqdm binary log")
+    data = memoryview(data)[len(MAGIC):]
+    res, pos, size = [], 0, RECORD.size
+    while pos + size <= len(data):
+        t, i, e, n, total = RECORD.unpack_from(data, pos)
+        pos += size
+        if e == DESC:
+            end = pos + int(n)
+            if end > len(data):
+                break
+            res.append((t, i, e, bytes(data[pos:end]).decode("utf-8", "replace"), None))
+            pos += -(-int(n) // size) * size
+        else:
+            res.append((t, i, e, n, None if isnan(total) else total))
+    return res
+
+
+class tqdm_trace(tqdm_auto):  # pylint: disable=inconsistent-mro
+    """
+    Standard `tqdm.auto.tqdm` but also sends events to a `Recorder`.
+
+    >>> from tqdm.contrib.trace import ChromeTraceRecorder, tqdm
+    >>> recorder = ChromeTraceRecorder("trace.json")
+    >>> for i in tqdm(iterable, recorder=recorder):
+    ...     ...
+    >>> recorder.flush()
+    """
+    recorder = None  # default for all bars
+
+    def __init__(self, *args, recorder=None, **kwargs):
+        """
+        Parameters
+        ----------
+        recorder  : Recorder, optional
+            [default: `tqdm_trace.recorder`].
+
+        See `tqdm.auto.tqdm.__init__` for other parameters.
+        """
+        if recorder is not None:
+            self.recorder = recorder
+        super().__init__(*args, **kwargs)
+        if not self.disable and self.recorder is not None:
+            self.recorder.start(self)
+            self.recorder.sample(self, self.format_dict)
+
+    def display(self, *args, **kwargs):
+        res = super().display(*args, **kwargs)
+        if self.recorder is not None and hasattr(self, 'trace_id'):
+            self.recorder.sample(self, self.format_dict)
+        return res
+
+    def reset(self, total=None):
+        super().reset(total=total)
+        if not self.disable and self.recorder is not None:
+            self.recorder.reset(self)
+
+    def close(self):
+        if self.disable:
+            return
+        super().close()
+        if self.recorder is not None and hasattr(self, 'trace_id'):
+            self.recorder.close(self)
+
+
+def ttrange(*args, **kwargs):
+    """Shortcut for `tqdm.contrib.trace.tqdm(range(*args), **kwargs)`."""
+    return tqdm_trace(range(*args), **kwargs)
+
+
+# Aliases
+tqdm = tqdm_trace
+trange = ttrange
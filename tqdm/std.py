@@ -8,17 +8,21 @@ Usage:
 ...     ...
 """
 import sys
-from collections import OrderedDict, defaultdict
+from collections import OrderedDict, defaultdict, deque
 from contextlib import contextmanager
-from datetime import datetime, timedelta, timezone
+from functools import partial, wraps
+from heapq import heapify, heappop, heappush
+from itertools import count
+from math import exp, floor, isfinite, log, log1p, sqrt
 from numbers import Number
-from time import time
+from threading import Lock, get_ident, local
+from time import perf_counter, time
 from warnings import warn
-from weakref import WeakSet
+from weakref import WeakSet, ref
 
-from ._monitor import TMonitor
+from ._monitor import TClock, TMonitor, TRenderer
 from .utils import (
-    CallbackIOWrapper, Comparable, DisableOnWriteError, FormatReplace, SimpleTextIOWrapper,
+    CallbackIOWrapper, Comparable, DisableOnWriteError, FormatTemplate, SimpleTextIOWrapper,
     _is_ascii, _screen_shape_wrapper, _supports_unicode, _term_move_up, disp_len, disp_trim,
     envwrap)
 
@@ -239,6 +243,386 @@ class EMA:
         return self.last / (1 - beta ** self.calls) if self.calls else self.last
 
 
+class RateEstimator:
+    """
+    Base class for `tqdm(..., estimator=...)`, which is fed the cumulative
+    count `n` at time `t` (in seconds) on every display.
+    Use a new instance per bar.
+    By default, estimates the `EMA` of the rate between consecutive samples
+    (like `tqdm(..., smoothing=...)`).
+
+    Parameters
+    ----------
+    smoothing  : float, optional
+        See `EMA` [default: 0.3].
+    """
+    def __init__(self, smoothing=0.3):
+        self.smoothing = smoothing
+        self.reset()
+
+    def add(self, n, t):
+        """Include a new sample."""
+        if self.last is not None:
+            dn, dt = n - self.last[0], t - self.last[1]
+            if dn and dt > 0:
+                self._ema_dn(dn)
+                self._ema_dt(dt)
+        self.last = n, t
+
+    def rate(self, n=None, total=None):
+        """
+        Returns the estimated rate (per second) at which the remaining
+        `total - n` will be processed (or `None` if unknown).
+        """
+        return self._ema_dn() / self._ema_dt() if self._ema_dt() else None
+
+    def reset(self):
+        """Discard all samples."""
+        self.last = None
+        self._ema_dn, self._ema_dt = EMA(self.smoothing), EMA(self.smoothing)
+
+
+class WindowRate(RateEstimator):
+    """
+    Average rate over (approximately) the last `window` seconds.
+
+    Parameters
+    ----------
+    window  : float, optional
+        Seconds to average over [default: 10].
+    size  : int, optional
+        Maximum number of samples (i.e. ring buffer size) [default: 256].
+    """
+    def __init__(self, window=10, size=256):
+        self.window = window
+        self.samples = deque(maxlen=size)  # [(t, n), ...]
+
+    def add(self, n, t):
+        samples = self.samples
+        samples.append((t, n))
+        # keep the latest sample at least `window` old as the start
+        while len(samples) > 2 and t - samples[1][0] >= self.window:
+            samples.popleft()
+
+    def rate(self, n=None, total=None):
+        if len(self.samples) < 2:
+            return None
+        (t0, n0), (t1, n1) = self.samples[0], self.samples[-1]
+        return (n1 - n0) / (t1 - t0) if t1 > t0 else None
+
+    def reset(self):
+        self.samples.clear()
+
+
+class DecayRate(RateEstimator):
+    """
+    Exponential moving average rate, with weights decaying per second
+    (rather than per sample as with `EMA`), so that irregular display
+    intervals do not skew the estimate.
+
+    Parameters
+    ----------
+    half_life  : float, optional
+        Seconds after which a sample's weight is halved [default: 5].
+    """
+    def __init__(self, half_life=5):
+        self.half_life = half_life
+        self.reset()
+
+    def add(self, n, t):
+        if self.last is not None:
+            last_n, last_t = self.last
+            dt = t - last_t
+            decay = 2 ** (-dt / self.half_life)
+            self.dn = decay * self.dn + n - last_n
+            self.dt = decay * self.dt + dt
+        self.last = n, t
+
+    def rate(self, n=None, total=None):
+        return self.dn / self.dt if self.dt else None
+
+    def reset(self):
+        self.last = None
+        self.dn = self.dt = 0
+
+
+class RegressionRate(WindowRate):
+    """
+    Least-squares fit of a linearly changing rate (i.e. quadratic `n`)
+    over the last `window` seconds, extrapolated to `total`.
+    Useful for accelerating/decelerating workloads.
+
+    Parameters
+    ----------
+    window  : float, optional
+        Seconds to fit over [default: 30].
+    size  : int, optional
+        Maximum number of samples (i.e. ring buffer size) [default: 512].
+    """
+    def __init__(self, window=30, size=512):
+        super().__init__(window=window, size=size)
+
+    def fit(self):
+        """Returns the current rate and acceleration (or `None`)."""
+        t1, n1 = self.samples[-1]
+        s = [0.0] * 5  # sum(x ** i)
+        y = [0.0] * 3  # sum(n * x ** i)
+        for t, n in self.samples:
+            x, n = t - t1, n - n1  # for numerical stability
+            xi = 1.0
+            for i in range(5):
+                s[i] += xi
+                if i < 3:
+                    y[i] += n * xi
+                xi *= x
+
+        def det(a, b, c):
+            # of 3x3 matrix with columns a, b, c
+            return (a[0] * (b[1] * c[2] - b[2] * c[1]) - b[0] * (a[1] * c[2] - a[2] * c[1])
+                    + c[0] * (a[1] * b[2] - a[2] * b[1]))
+
+        cols = s[0:3], s[1:4], s[2:5]
+        d = det(*cols)
+        if abs(d) < 1e-12:
+            return None
+        # Cramer's rule for n = k + slope * x + quad * x ** 2
+        slope = det(cols[0], y, cols[2]) / d
+        quad = det(cols[0], cols[1], y) / d
+        return slope, 2 * quad
+
+    def rate(self, n=None, total=None):
+        fit = self.fit() if len(self.samples) > 2 else None
+        if fit is None:
+            return super().rate()
+        slope, accel = fit
+        remaining = None if n is None or total is None else total - n
+        if not remaining or remaining < 0:
+            return slope if slope > 0 else super().rate()
+        # solve `remaining = slope * dt + accel / 2 * dt ** 2`
+        disc = slope ** 2 + 2 * accel * remaining
+        if disc < 0 or slope + sqrt(disc) <= 0:  # predicted to stall
+            return super().rate()
+        dt = 2 * remaining / (slope + sqrt(disc))
+        return remaining / dt
+
+
+RATE_ESTIMATORS = {'window': WindowRate, 'decay': DecayRate, 'regression': RegressionRate}
+
+
+class ShardedCounter:
+    """
+    Thread-safe counter which does not lock on `add()`: each thread
+    accumulates into its own shard, and shards are only summed on `pop()`.
+    """
+    def __init__(self):
+        self.shards = []
+        self.popped = 0
+        self._local = local()
+        self._lock = Lock()  # for `pop()` and new shards only
+
+    def add(self, n=1):
+        """
+        Parameters
+        ----------
+        n  : int or float, optional
+            Increment to add to the calling thread's shard [default: 1].
+        """
+        try:
+            self._local.shard[0] += n  # only ever written by this thread
+        except AttributeError:
+            shard = self._local.shard = [n]
+            with self._lock:
+                self.shards.append(shard)
+
+    def pop(self):
+        """Returns the total added since the last call."""
+        with self._lock:
+            total = sum(shard[0] for shard in self.shards)
+            total, self.popped = total - self.popped, total
+        return total
+
+
+def _call_weak(func, instance_ref, *args, **kwargs):
+    return func(instance_ref(), *args, **kwargs)
+
+
+class Overhead:
+    """
+    Accumulates the time spent in (and number of calls to) named operations.
+
+    Parameters
+    ----------
+    names  : iterable of str, optional
+        Operations to report (even if never called).
+    """
+    def __init__(self, names=("update", "format_meter", "lock", "write")):
+        self.time = dict.fromkeys(names, 0.0)
+        self.calls = dict.fromkeys(names, 0)
+
+    def timed(self, name, func, instance=None):
+        """
+        Returns `func` wrapped to accumulate its duration under `name`.
+        If `instance` is given, `func` is bound to it via a weak reference
+        (so that the result can be stored on `instance` without a cycle).
+        """
+        self.time.setdefault(name, 0.0)
+        self.calls.setdefault(name, 0)
+        time_, calls = self.time, self.calls
+        call = func if instance is None else partial(_call_weak, func, ref(instance))
+
+        @wraps(func)
+        def inner(*args, **kwargs):
+            start_t = perf_counter()
+            try:
+                return call(*args, **kwargs)
+            finally:
+                time_[name] += perf_counter() - start_t
+                calls[name] += 1
+        return inner
+
+    def __str__(self):
+        return ", ".join(f"{name} {t * 1e3:.3g}ms/{self.calls[name]}"
+                         for name, t in self.time.items())
+
+
+class Histogram:
+    """
+    Compact histogram of non-negative values in logarithmic buckets
+    (i.e. with constant relative precision), for estimating percentiles.
+
+    Parameters
+    ----------
+    precision  : float, optional
+        Relative width of buckets [default: 0.05].
+    """
+    def __init__(self, precision=0.05):
+        self.log_base = log1p(precision)
+        self.counts = defaultdict(int)  # {bucket: count}
+        self.total = 0
+
+    def add(self, x, count=1):
+        """
+        Parameters
+        ----------
+        x  : float
+            Value to include.
+        count  : int or float, optional
+            Number of occurrences of `x` [default: 1].
+        """
+        self.counts[floor(log(x) / self.log_base) if x > 0 else float('-inf')] += count
+        self.total += count
+
+    def percentiles(self, *qs):
+        """
+        Returns the (bucket midpoint) values below which each of the given
+        percentages `qs` (in ascending order) of counts fall.
+        Values are `nan` if empty.
+        """
+        res = []
+        if not self.total:
+            return [float('nan')] * len(qs)
+        ranks = [q / 100 * self.total for q in qs]
+        cum = 0
+        for bucket in sorted(self.counts):
+            cum += self.counts[bucket]
+            while ranks and cum >= ranks[0]:
+                res.append(exp((bucket + 0.5) * self.log_base))
+                ranks.pop(0)
+            if not ranks:
+                break
+        # guard against rounding errors
+        return res + [exp((bucket + 0.5) * self.log_base)] * len(ranks)
+
+
+class TimedLock:
+    """Lock proxy accumulating the time spent in `acquire()` as "lock"."""
+    def __init__(self, lock, overhead):
+        self.acquire = overhead.timed("lock", lock.acquire)
+        self.release = lock.release
+
+    def __enter__(self):
+        self.acquire()
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+class Positions:
+    """
+    Allocator of bar positions (screen rows) in O(log n) per bar.
+    Counts bars per `abs(pos)`, keeps a (lazily pruned) heap of freed
+    positions, and indexes unfixed (`pos >= 0`) bars beyond each
+    overflow threshold (`nrows - 1`) which has been queried.
+    """
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.used = {}  # {abs(pos): number of bars}
+        self.free = []  # heap of freed positions `< top` (may be stale)
+        self.top = 0  # positions `>= top` are free unless `used` (fixed)
+        self.overflow = {}  # {threshold: heap of `(pos, seq, weakref(bar))`}
+        self._seq = count()
+
+    def first_free(self):
+        """Returns the lowest unused position."""
+        used, free = self.used, self.free
+        while free and free[0] in used:
+            heappop(free)
+        if free:
+            return free[0]
+        while self.top in used:
+            self.top += 1
+        return self.top
+
+    def add(self, bar):
+        """Marks `abs(bar.pos)` as used."""
+        pos = abs(bar.pos)
+        self.used[pos] = self.used.get(pos, 0) + 1
+        bar._pos_held = self.used  # i.e. since the last `reset()`
+        for last, heap in self.overflow.items():
+            if bar.pos >= last:
+                heappush(heap, (bar.pos, next(self._seq), ref(bar)))
+
+    def remove(self, bar):
+        """
+        Marks `abs(bar.pos)` as unused (if no other bar uses it).
+        No-op if not `add()`ed since the last `reset()`.
+        """
+        if getattr(bar, '_pos_held', None) is not self.used:
+            return
+        bar._pos_held = None
+        pos = abs(bar.pos)
+        n = self.used.get(pos, 0)
+        if n > 1:
+            self.used[pos] = n - 1
+        elif n:
+            del self.used[pos]
+            if pos < self.top:
+                heappush(self.free, pos)
+
+    def first_overflow(self, last, instances):
+        """
+        Returns the bar in `instances` with the lowest `pos >= last`
+        (or `None`).
+        """
+        heap = self.overflow.get(last)
+        if heap is None:
+            if len(self.overflow) >= 8:  # e.g. many terminal resizes
+                self.overflow.clear()
+            heap = self.overflow[last] = [
+                (i.pos, next(self._seq), ref(i)) for i in instances
+                if getattr(i, "pos", -1) >= last]
+            heapify(heap)
+        while heap:
+            pos, _, bar = heap[0]
+            bar = bar()
+            if bar is not None and bar.pos == pos and bar in instances:
+                return bar
+            heappop(heap)  # closed or moved
+        return None
+
+
 class tqdm(Comparable):
     """
     Decorate an iterable object, returning an iterator which acts exactly
@@ -350,6 +734,66 @@ class tqdm(Comparable):
         Bar colour (e.g. 'green', '#00ff00').
     delay  : float, optional
         Don't display until [default: 0] seconds have elapsed.
+    background  : bool, optional
+        If set, iterating and `update()` only increment the counter,
+        while a shared thread renders the bar every `render_interval`
+        seconds (subject to `mininterval` and `maxinterval`) [default: False].
+        Useful to avoid lock contention when updating from many threads.
+    sharded  : bool, optional
+        If set (implies `background`), `update()` adds to a thread-local
+        counter without locking (and returns None), which is folded into `n`
+        at render time [default: False]. Useful to share one bar between many threads
+        without losing increments.
+    clock  : str or callable, optional
+        Source of time in seconds: 'wall' [default: `time.time`],
+        'monotonic' (`time.perf_counter`, unaffected by system clock
+        adjustments), 'coarse' (monotonic, but updated every
+        `clock_interval` seconds by a shared thread to reduce overhead in
+        tight loops), or a function.
+    predictive_miniters  : bool, optional
+        If set (and `miniters` is unspecified), only checks the time at
+        the iteration predicted (from the rate since the last display) to
+        reach `mininterval`, rescheduling if checked too early [default: False].
+        Reduces time checks to about one per display, while adapting to
+        rate changes within one display.
+    render_budget  : float, optional
+        Maximum fraction of wall time to spend displaying (e.g. 0.01 for 1%).
+        If set, `mininterval` (and `maxinterval`) are widened as needed
+        according to the measured cost of displaying [default: None].
+        Useful for slow outputs (e.g. remote terminals or network files).
+        The total time spent displaying is stored in `render_t`.
+    stats  : bool, optional
+        If set, records the time spent in `update()` (including displays
+        from iteration), `format_meter()`, waiting for the lock, and
+        writing, available as `format_dict["stats"]` and printed on
+        `close()` (with `jsonl`, included in the final record instead)
+        [default: `tqdm.stats`, i.e. False].
+    histogram  : bool, optional
+        If set, records a (log-bucketed) histogram of seconds per
+        iteration, sampled at each display (i.e. averaged over
+        `mininterval`). Percentiles are available as `p50`, `p95`, `p99`
+        in `format_dict` and `bar_format` [default: False].
+    estimator  : str or RateEstimator, optional
+        Rate (and thus ETA) estimator, sampled at each display:
+        'window' (average over the last 10 seconds), 'decay' (moving
+        average with a 5 second half-life), 'regression' (linearly
+        changing rate fitted over the last 30 seconds), or an instance of
+        a `tqdm.std.RateEstimator` subclass (e.g. `WindowRate(60)`)
+        [default: None, i.e. `EMA` with `smoothing`].
+    jsonl  : bool or float, optional
+        If set, writes machine-readable JSON lines (desc, n, total, unit,
+        elapsed, rate, remaining, postfix) instead of bars, at most every
+        `jsonl` seconds (`True`: 1) plus a final record (closed: true).
+        If set to None, only if `file` is not a TTY (e.g. CI logs)
+        [default: False].
+    stall_timeout  : float, optional
+        If set, the monitor thread reports when `n` has not changed for
+        `stall_timeout` seconds, including the stack of the thread last
+        seen iterating/updating, via `tqdm.stall_callback(bar, message)`
+        [default: None]. Checks run every `stall_timeout / 4` seconds
+        (at most `tqdm.monitor_interval`), so reports may be up to two
+        checks late.
+        The default `stall_callback` logs a warning.
     gui  : bool, optional
         WARNING: internal parameter - do not use.
         Use tqdm.gui.tqdm(...) instead. If set, will attempt to use
@@ -362,7 +806,15 @@ class tqdm(Comparable):
 
     monitor_interval = 10  # set to 0 to disable the thread
     monitor = None
+    render_interval = 0.1  # frame period of the `background` rendering thread
+    renderer = None
+    sync_output = False  # wrap multi-bar frames in synchronised output sequences
+    clock_interval = 0.01  # resolution of `clock="coarse"`
+    clock_ticker = None
+    stats = False  # default for all bars' `stats`
+    stall_callback = None  # `f(bar, message)` for `stall_timeout` (default: log)
     _instances = WeakSet()
+    _positions = Positions()  # of `_instances`
 
     @staticmethod
     def format_sizeof(num, suffix='', divisor=1000):
@@ -451,12 +903,25 @@ class tqdm(Comparable):
             fp_flush()
 
         last_len = [0]
-
-        def print_status(s):
+        last_s = ['']
+
+        def format_status(s, changed_only=False):
+            """
+            Returns what `print_status(s)` would write, or `None` if
+            `changed_only` and `s` is identical to the previous status.
+            """
+            if changed_only and s == last_s[0]:
+                return None
             len_s = disp_len(s)
-            fp_write('\r' + s + (' ' * max(last_len[0] - len_s, 0)))
+            res = '\r' + s + (' ' * max(last_len[0] - len_s, 0))
             last_len[0] = len_s
+            last_s[0] = s
+            return res
 
+        def print_status(s):
+            fp_write(format_status(s))
+
+        print_status.format_status = format_status  # for composing frames
         return print_status
 
     @staticmethod
@@ -543,123 +1008,127 @@ class tqdm(Comparable):
                 rate *= unit_scale  # by default rate = self.avg_dn / self.avg_dt
             unit_scale = False
 
-        elapsed_str = tqdm.format_interval(elapsed)
-
         # if unspecified, attempt to use rate = average speed
         # (we allow manual override since predicting time is an arcane art)
         if rate is None and elapsed:
             rate = (n - initial) / elapsed
         inv_rate = 1 / rate if rate else None
         format_sizeof = tqdm.format_sizeof
-        rate_noinv_fmt = ((format_sizeof(rate) if unit_scale else f'{rate:5.2f}')
-                          if rate else '?') + unit + '/s'
-        rate_inv_fmt = (
-            (format_sizeof(inv_rate) if unit_scale else f'{inv_rate:5.2f}')
-            if inv_rate else '?') + 's/' + unit
-        rate_fmt = rate_inv_fmt if inv_rate and inv_rate > 1 else rate_noinv_fmt
-
-        if unit_scale:
-            n_fmt = format_sizeof(n, divisor=unit_divisor)
-            total_fmt = format_sizeof(total, divisor=unit_divisor) if total is not None else '?'
-        else:
-            n_fmt = str(n)
-            total_fmt = str(total) if total is not None else '?'
 
         try:
             postfix = ', ' + postfix if postfix else ''
         except TypeError:
             pass
 
-        remaining = (total - n) / rate if rate and total else 0
-        remaining_str = tqdm.format_interval(remaining) if rate else '?'
-        try:
-            eta_dt = (datetime.now() + timedelta(seconds=remaining)
-                      if rate and total else datetime.fromtimestamp(0, timezone.utc))
-        except OverflowError:
-            eta_dt = datetime.max
-
-        # format the stats displayed to the left and right sides of the bar
-        if prefix:
-            # old prefix setup work around
-            bool_prefix_colon_already = (prefix[-2:] == ": ")
-            l_bar = prefix if bool_prefix_colon_already else prefix + ": "
+        if total:
+            if not bar_format:
+                bar_format = "{l_bar}{bar}{r_bar}"
+            elif not prefix:
+                # auto-remove colon for empty `{desc}`
+                bar_format = bar_format.replace("{desc}: ", '')
+        # parsed once per `bar_format`, so that only referenced fields are computed
+        template = FormatTemplate.compile(bar_format) if bar_format else None
+        if total and ncols == 0:
+            need = {'l_bar', 'r_bar'}
+        elif template is not None:
+            need = template.fields
         else:
-            l_bar = ''
+            need = {'n_fmt', 'elapsed', 'rate_fmt'}
+        if 'r_bar' in need:
+            need = need | {'n_fmt', 'total_fmt', 'elapsed', 'remaining', 'rate_fmt'}
 
-        r_bar = f'| {n_fmt}/{total_fmt} [{elapsed_str}<{remaining_str}, {rate_fmt}{postfix}]'
-
-        # Custom bar formatting
-        # Populate a dict with all available progress indicators
+        remaining = (total - n) / rate if rate and total else 0
         format_dict = {
             # slight extension of self.format_dict
-            'n': n, 'n_fmt': n_fmt, 'total': total, 'total_fmt': total_fmt,
-            'elapsed': elapsed_str, 'elapsed_s': elapsed,
+            'n': n, 'total': total, 'elapsed_s': elapsed,
             'ncols': ncols, 'desc': prefix or '', 'unit': unit,
             'rate': inv_rate if inv_rate and inv_rate > 1 else rate,
-            'rate_fmt': rate_fmt, 'rate_noinv': rate,
-            'rate_noinv_fmt': rate_noinv_fmt, 'rate_inv': inv_rate,
-            'rate_inv_fmt': rate_inv_fmt,
+            'rate_noinv': rate, 'rate_inv': inv_rate,
             'postfix': postfix, 'unit_divisor': unit_divisor,
             'colour': colour,
             # plus more useful definitions
-            'remaining': remaining_str, 'remaining_s': remaining,
-            'l_bar': l_bar, 'r_bar': r_bar, 'eta': eta_dt,
-            **extra_kwargs}
+            'remaining_s': remaining}
+
+        if 'n_fmt' in need:
+            format_dict['n_fmt'] = (
+                format_sizeof(n, divisor=unit_divisor) if unit_scale else str(n))
+        if 'total_fmt' in need:
+            format_dict['total_fmt'] = (
+                '?' if total is None else
+                format_sizeof(total, divisor=unit_divisor) if unit_scale else str(total))
+        if 'elapsed' in need:
+            format_dict['elapsed'] = tqdm.format_interval(elapsed)
+        if 'remaining' in need:
+            format_dict['remaining'] = tqdm.format_interval(remaining) if rate else '?'
+        if need & {'rate_fmt', 'rate_noinv_fmt'}:
+            format_dict['rate_noinv_fmt'] = (
+                (format_sizeof(rate) if unit_scale else f'{rate:5.2f}')
+                if rate else '?') + unit + '/s'
+        if need & {'rate_fmt', 'rate_inv_fmt'}:
+            format_dict['rate_inv_fmt'] = (
+                (format_sizeof(inv_rate) if unit_scale else f'{inv_rate:5.2f}')
+                if inv_rate else '?') + 's/' + unit
+        if 'rate_fmt' in need:
+            format_dict['rate_fmt'] = format_dict[
+                'rate_inv_fmt' if inv_rate and inv_rate > 1 else 'rate_noinv_fmt']
+        if 'eta' in need:
+            from datetime import datetime, timedelta, timezone  # slow import
+            try:
+                format_dict['eta'] = (
+                    datetime.now() + timedelta(seconds=remaining)
+                    if rate and total else datetime.fromtimestamp(0, timezone.utc))
+            except OverflowError:
+                format_dict['eta'] = datetime.max
+
+        if template is None:
+            # no total: no bar & ETA, just progress stats
+            res = (f'{(prefix + ": ") if prefix else ""}'
+                   f'{format_dict["n_fmt"]}{unit} [{format_dict["elapsed"]}, '
+                   f'{format_dict["rate_fmt"]}{postfix}]')
+            return disp_trim(res, ncols) if ncols else res
+
+        # format the stats displayed to the left and right sides of the bar
+        if 'r_bar' in need:
+            format_dict['r_bar'] = (
+                f'| {format_dict["n_fmt"]}/{format_dict["total_fmt"]}'
+                f' [{format_dict["elapsed"]}<{format_dict["remaining"]},'
+                f' {format_dict["rate_fmt"]}{postfix}]')
+        format_dict.update(extra_kwargs)
+        if prefix:
+            # old prefix setup work around
+            bool_prefix_colon_already = (prefix[-2:] == ": ")
+            l_bar = prefix if bool_prefix_colon_already else prefix + ": "
+        else:
+            l_bar = ''
 
         # total is known: we can predict some stats
         if total:
             # fractional and percentage progress
             frac = n / total
             percentage = frac * 100
-
             l_bar += f'{percentage:3.0f}%|'
-
             if ncols == 0:
-                return l_bar[:-1] + r_bar[1:]
-
-            format_dict.update(l_bar=l_bar)
-            if bar_format:
-                format_dict.update(percentage=percentage)
-
-                # auto-remove colon for empty `{desc}`
-                if not prefix:
-                    bar_format = bar_format.replace("{desc}: ", '')
-            else:
-                bar_format = "{l_bar}{bar}{r_bar}"
-
-            full_bar = FormatReplace()
-            nobar = bar_format.format(bar=full_bar, **format_dict)  # no `{bar}`
-            if not full_bar.format_called:
-                return disp_trim(nobar, ncols) if ncols else nobar
-
-            # Formatting progress bar space available for bar's display
-            full_bar = Bar(frac,
-                           max(1, ncols - disp_len(nobar)) if ncols else 10,
-                           charset=Bar.ASCII if ascii is True else ascii or Bar.UTF,
-                           colour=colour)
-            if not _is_ascii(full_bar.charset) and _is_ascii(bar_format):
-                bar_format = str(bar_format)
-            res = bar_format.format(bar=full_bar, **format_dict)
-            return disp_trim(res, ncols) if ncols else res
-
-        elif bar_format:
+                return l_bar[:-1] + format_dict['r_bar'][1:]
+        else:
             # user-specified bar_format but no total
+            frac = percentage = 0
             l_bar += '|'
-            format_dict.update(l_bar=l_bar, percentage=0)
-            full_bar = FormatReplace()
-            nobar = bar_format.format(bar=full_bar, **format_dict)
-            if not full_bar.format_called:
-                return disp_trim(nobar, ncols) if ncols else nobar
-            full_bar = Bar(0,
-                           max(1, ncols - disp_len(nobar)) if ncols else 10,
-                           charset=Bar.BLANK, colour=colour)
-            res = bar_format.format(bar=full_bar, **format_dict)
-            return disp_trim(res, ncols) if ncols else res
-        else:
-            # no total: no bar & ETA, just progress stats
-            res = (f'{(prefix + ": ") if prefix else ""}'
-                   f'{n_fmt}{unit} [{elapsed_str}, {rate_fmt}{postfix}]')
-            return disp_trim(res, ncols) if ncols else res
+        format_dict.update(l_bar=l_bar, percentage=percentage)
+
+        # format everything but `{bar}`
+        res = template.render(format_dict, defer=('bar',))
+        nobar = ''.join(i for i in res if isinstance(i, str))
+        if all(isinstance(i, str) for i in res):  # no `{bar}`
+            return disp_trim(nobar, ncols) if ncols else nobar
+
+        # Formatting progress bar space available for bar's display
+        full_bar = Bar(frac,
+                       max(1, ncols - disp_len(nobar)) if ncols else 10,
+                       charset=(Bar.ASCII if ascii is True else ascii or Bar.UTF)
+                       if total else Bar.BLANK,
+                       colour=colour)
+        res = ''.join(i if isinstance(i, str) else format(full_bar, i[1]) for i in res)
+        return disp_trim(res, ncols) if ncols else res
 
     def __new__(cls, *_, **__):
         instance = object.__new__(cls)
@@ -675,14 +1144,16 @@ class tqdm(Comparable):
                          " (monitor_interval = 0) due to:\n" + str(e),
                          TqdmMonitorWarning, stacklevel=2)
                     cls.monitor_interval = 0
+            elif cls.monitor is not None:
+                cls.monitor.register(instance)
         return instance
 
     @classmethod
     def _get_free_pos(cls, instance=None):
         """Skips specified instance."""
-        positions = {abs(inst.pos) for inst in cls._instances
-                     if inst is not instance and hasattr(inst, "pos")}
-        return min(set(range(len(positions) + 1)).difference(positions))
+        if not any(inst is not instance for inst in cls._instances):
+            cls._positions.reset()  # no other bars (e.g. `_instances.clear()`ed)
+        return cls._positions.first_free()
 
     @classmethod
     def _decr_instances(cls, instance):
@@ -695,24 +1166,25 @@ class tqdm(Comparable):
         (tqdm<=4.44.1 moved ALL subsequent unfixed bars up.)
         """
         with cls._lock:
+            positions = cls._positions
             try:
                 cls._instances.remove(instance)
             except KeyError:
-                # if not instance.gui:  # pragma: no cover
-                #     raise
-                pass  # py2: maybe magically removed already
-            # else:
-            if not instance.gui:
+                # e.g. collected by `gc` (weakrefs are cleared before `__del__`)
+                pass
+            positions.remove(instance)
+            if not cls._instances:
+                positions.reset()
+            elif not instance.gui:
                 last = (instance.nrows or 20) - 1
                 # find unfixed (`pos >= 0`) overflow (`pos >= nrows - 1`)
-                instances = list(filter(
-                    lambda i: hasattr(i, "pos") and last <= i.pos,
-                    cls._instances))
+                inst = positions.first_overflow(last, cls._instances)
                 # set first found to current `pos`
-                if instances:
-                    inst = min(instances, key=lambda i: i.pos)
+                if inst is not None:
                     inst.clear(nolock=True)
+                    positions.remove(inst)
                     inst.pos = abs(instance.pos)
+                    positions.add(inst)
 
     @classmethod
     def write(cls, s, file=None, end="\n", nolock=False):
@@ -741,19 +1213,97 @@ class tqdm(Comparable):
             if not nolock:
                 cls.get_lock().acquire()
             # Clear all bars
-            inst_cleared = []
-            for inst in getattr(cls, '_instances', []):
-                # Clear instance if in the target output file
-                # or if write output + tqdm output are both either
-                # sys.stdout or sys.stderr (because both are mixed in terminal)
+            # in the target output file
+            # or if write output + tqdm output are both either
+            # sys.stdout or sys.stderr (because both are mixed in terminal)
+            inst_cleared = [
+                inst for inst in getattr(cls, '_instances', [])
                 if hasattr(inst, "start_t") and (inst.fp == fp or all(
-                        f in (sys.stdout, sys.stderr) for f in (fp, inst.fp))):
-                    inst.clear(nolock=True)
-                    inst_cleared.append(inst)
+                    f in (sys.stdout, sys.stderr) for f in (fp, inst.fp)))]
+            cls.refresh_all(inst_cleared, nolock=True, clear=True)
             yield
             # Force refresh display of bars we cleared
-            for inst in inst_cleared:
-                inst.refresh(nolock=True)
+            cls.refresh_all(inst_cleared, nolock=True)
+        finally:
+            if not nolock:
+                cls._lock.release()
+
+    @classmethod
+    def refresh_all(cls, instances=None, nolock=False, clear=False):
+        """
+        Redraw (or clear) multiple bars, composing all lines destined for
+        the same file into a single frame (and a single `write()`).
+        Lines which have not changed since last drawn are skipped.
+        Set `sync_output = True` to wrap frames in (flicker-reducing)
+        terminal synchronised output sequences.
+
+        Parameters
+        ----------
+        instances  : iterable of tqdm, optional
+            Bars to draw [default: all instances of `cls`].
+        nolock  : bool, optional
+            If `True`, does not lock.
+        clear  : bool, optional
+            If `True`, clears rather than draws bars [default: `False`].
+        """
+        if not nolock:
+            cls.get_lock().acquire()
+        try:
+            if instances is None:
+                instances = list(cls._instances)
+            frames = []  # [(fp, [(pos, line), ...]), ...]
+            for inst in instances:
+                if inst.disable or not hasattr(inst, "start_t"):
+                    continue
+                format_status = None if (
+                    getattr(inst, 'jsonl', False)
+                    # e.g. `tqdm.contrib.telegram` also updates a remote message
+                    or type(inst).display is not tqdm.display
+                    or type(inst).clear is not tqdm.clear) else getattr(
+                        getattr(inst, 'sp', None), 'format_status', None)
+                if format_status is None:  # custom `status_printer`/`display` or `jsonl`
+                    if clear:
+                        inst.clear(nolock=True)
+                    else:
+                        inst.refresh(nolock=True)
+                    continue
+                pos = abs(inst.pos)
+                nrows = inst.nrows or 20
+                if pos >= nrows:
+                    continue
+                start_t = perf_counter()
+                line = format_status(
+                    '' if clear else " ... (more hidden) ..." if pos == nrows - 1
+                    else inst.__str__(), changed_only=True)
+                if line is None:
+                    continue
+                for fp, lines in frames:
+                    if fp == inst.fp:
+                        break
+                else:
+                    lines = []
+                    frames.append((inst.fp, lines))
+                lines.append((pos, line, inst, perf_counter() - start_t))
+
+            for fp, lines in frames:
+                start_t = perf_counter()
+                frame = []
+                cur = 0
+                for pos, line, _, _ in sorted(lines, key=lambda i: i[0]):
+                    frame.append('\n' * (pos - cur) + line)
+                    cur = pos
+                frame.append(_term_move_up() * cur)
+                if clear:
+                    frame.append('\r')  # place cursor back at the beginning of line
+                frame = ''.join(frame)
+                if cls.sync_output:
+                    frame = '\x1b[?2026h' + frame + '\x1b[?2026l'
+                fp.write(frame)
+                getattr(fp, 'flush', lambda: None)()
+                # share the cost of writing between bars
+                dt = (perf_counter() - start_t) / len(lines)
+                for _, _, inst, format_t in lines:
+                    inst._add_render_time(format_t + dt)
         finally:
             if not nolock:
                 cls._lock.release()
@@ -956,14 +1506,17 @@ class tqdm(Comparable):
 
     # override defaults via env vars
     @envwrap("tqdm", is_method=True, types={'total': float, 'ncols': int, 'miniters': float,
-                                            'position': int, 'nrows': int})
+                                            'position': int, 'nrows': int,
+                                            'render_budget': float})
     def __init__(self, iterable=None, desc=None, total=None, leave=True, file=None,
                  ncols=None, mininterval=0.1, maxinterval=10.0, miniters=None,
                  ascii=None,  # pylint: disable=redefined-builtin
                  disable=False, unit='it', unit_scale=False, dynamic_ncols=False, smoothing=0.3,
                  bar_format=None, initial=0, position=None, postfix=None, unit_divisor=1000,
-                 write_bytes=False, lock_args=None, nrows=None, colour=None, delay=0.0, gui=False,
-                 **kwargs):
+                 write_bytes=False, lock_args=None, nrows=None, colour=None, delay=0.0,
+                 background=False, sharded=False, clock=None, predictive_miniters=False,
+                 render_budget=None, stats=None, histogram=False, estimator=None, jsonl=False,
+                 stall_timeout=None, gui=False, **kwargs):
         """see tqdm.tqdm for arguments"""
         if file is None:
             file = sys.stderr
@@ -979,6 +1532,9 @@ class tqdm(Comparable):
         if disable is None and hasattr(file, "isatty") and not file.isatty():
             disable = True
 
+        if jsonl is None:
+            jsonl = not (hasattr(file, "isatty") and file.isatty())
+
         if total is None and iterable is not None:
             try:
                 total = len(iterable)
@@ -999,7 +1555,14 @@ class tqdm(Comparable):
             self.leave = leave
             return
 
-        if kwargs:
+        unknown = None
+        if clock not in (None, 'wall', 'monotonic', 'coarse') and not callable(clock):
+            unknown = (f"Unknown clock: {clock!r}"
+                       " (expected 'wall', 'monotonic', 'coarse' or a callable)")
+        elif isinstance(estimator, str) and estimator not in RATE_ESTIMATORS:
+            unknown = (f"Unknown estimator: {estimator!r} (expected one of"
+                       f" {', '.join(map(repr, RATE_ESTIMATORS))} or a RateEstimator)")
+        if kwargs or unknown:
             self.disable = True
             with self._lock:
                 self.pos = self._get_free_pos(self)
@@ -1010,7 +1573,8 @@ class tqdm(Comparable):
                     "Use `position` instead for manual control.\n",
                     fp_write=getattr(file, 'write', sys.stderr.write))
                 if "nested" in kwargs else
-                TqdmKeyError("Unknown argument(s): " + str(kwargs)))
+                TqdmKeyError("Unknown argument(s): " + str(kwargs)) if kwargs else
+                TqdmKeyError(unknown))
 
         # Preprocess the arguments
         if (
@@ -1051,6 +1615,13 @@ class tqdm(Comparable):
         if smoothing is None:
             smoothing = 0
 
+        if sharded:
+            background = True
+        if background:
+            # never display from `update()`/`__iter__`: leave it to `TRenderer`
+            miniters = float('inf')
+            dynamic_miniters = False
+
         # Store the arguments
         self.iterable = iterable
         self.desc = desc or ''
@@ -1063,6 +1634,21 @@ class tqdm(Comparable):
         self.maxinterval = maxinterval
         self.miniters = miniters
         self.dynamic_miniters = dynamic_miniters
+        self.predictive_miniters = predictive_miniters
+        self.render_budget = render_budget
+        self.render_t = 0
+        self._intervals = mininterval, maxinterval  # before `render_budget` widening
+        self._widened = mininterval, maxinterval  # last set by `render_budget`
+        self._ema_render = EMA(0.3)
+        self.stats = type(self).stats if stats is None else stats
+        self._overhead = Overhead() if self.stats else None
+        if self.stats:
+            timed = self._overhead.timed
+            self.update = timed("update", type(self).update, self)
+            self.format_meter = timed("format_meter", self.format_meter)
+            self._lock = TimedLock(self._lock, self._overhead)
+            if hasattr(file, 'write'):
+                file.wrapper_setattr('write', timed("write", file.write))
         self.ascii = ascii
         self.disable = disable
         self.unit = unit
@@ -1071,16 +1657,51 @@ class tqdm(Comparable):
         self.initial = initial
         self.lock_args = lock_args
         self.delay = delay
+        self.background = background
+        self._counter = ShardedCounter() if sharded else None
+        if sharded:
+            # lock-free; see `_fold_shards()`
+            self.update = self._counter.add
+            if self.stats:
+                self.update = self._overhead.timed("update", self.update)
         self.gui = gui
         self.dynamic_ncols = dynamic_ncols
         self.smoothing = smoothing
         self._ema_dn = EMA(smoothing)
         self._ema_dt = EMA(smoothing)
         self._ema_miniters = EMA(smoothing)
+        self.histogram = Histogram() if histogram else None
+        self.estimator = (RATE_ESTIMATORS[estimator]() if isinstance(estimator, str)
+                          else estimator)
+        self.jsonl = 1 if jsonl is True else jsonl
+        self.stall_timeout = stall_timeout
+        self._thread_id = get_ident()  # for stall reports
+        self._jsonl_t = None  # time of last record
         self.bar_format = bar_format
         self.postfix = None
         self.colour = colour
-        self._time = time
+        self.clock = clock
+        if clock == 'coarse':
+            cls = type(self)
+            with self._lock:
+                ticker = cls.clock_ticker
+                if ticker is None or not (ticker.is_alive() and ticker.report()):
+                    # (re)start, e.g. if none, exited, or in a forked child
+                    try:
+                        ticker = cls.clock_ticker = TClock(cls, cls.clock_interval)
+                    except Exception as e:  # pragma: nocover
+                        warn("tqdm:using monotonic clock due to:\n" + str(e),
+                             TqdmMonitorWarning, stacklevel=2)
+                        ticker = None
+                if ticker is not None:
+                    ticker.bars += 1
+                    self._ticker = ticker
+                    self._time = partial(getattr, ticker, 'now')
+                else:  # pragma: nocover
+                    self._time = perf_counter
+        else:
+            self._time = (time if clock in (None, 'wall') else
+                          perf_counter if clock == 'monotonic' else clock)
         if postfix:
             try:
                 self.set_postfix(refresh=False, **postfix)
@@ -1096,6 +1717,7 @@ class tqdm(Comparable):
         with self._lock:
             # mark fixed positions as negative
             self.pos = self._get_free_pos(self) if position is None else -position
+            self._positions.add(self)
 
         if not gui:
             # Initialize the screen printer
@@ -1107,6 +1729,30 @@ class tqdm(Comparable):
         self.last_print_t = self._time()
         # NB: Avoid race conditions by setting start_t at the very end of init
         self.start_t = self.last_print_t
+        if self.estimator is not None:
+            self.estimator.add(self.n, self.start_t)
+
+        if background:
+            cls = type(self)
+            with self._lock:
+                if cls.renderer is not None and cls.renderer.is_alive() \
+                        and cls.renderer.report():
+                    cls.renderer.add(self)
+                else:  # (re)start, e.g. if none, exited, or in a forked child
+                    try:
+                        cls.renderer = TRenderer(cls, cls.render_interval)
+                    except Exception as e:  # pragma: nocover
+                        warn("tqdm:disabling background rendering due to:\n" + str(e),
+                             TqdmMonitorWarning, stacklevel=2)
+                        self.background = False
+                        self._fold_shards()
+                        self._counter = None
+                        if self.stats:
+                            self.update = self._overhead.timed("update", type(self).update, self)
+                        else:
+                            self.__dict__.pop('update', None)
+                        self.miniters = 0
+                        self.dynamic_miniters = True
 
     def __bool__(self):
         if self.total is not None:
@@ -1177,12 +1823,24 @@ class tqdm(Comparable):
                 yield obj
             return
 
+        self._thread_id = get_ident()
+        if self.background:
+            # only count: `TRenderer` displays
+            try:
+                for obj in iterable:
+                    yield obj
+                    self.n += 1
+            finally:
+                self.close()
+            return
+
         mininterval = self.mininterval
         last_print_t = self.last_print_t
         last_print_n = self.last_print_n
         min_start_t = self.start_t + self.delay
         n = self.n
         time = self._time
+        predictive = self.predictive_miniters and self.dynamic_miniters and mininterval
 
         try:
             for obj in iterable:
@@ -1198,6 +1856,10 @@ class tqdm(Comparable):
                         self.update(n - last_print_n)
                         last_print_n = self.last_print_n
                         last_print_t = self.last_print_t
+                        mininterval = self.mininterval  # see `render_budget`
+                    elif predictive and dt < mininterval:
+                        # too early: reschedule
+                        self.miniters = self._predict_miniters(n - last_print_n, dt)
         finally:
             self.n = n
             self.close()
@@ -1226,7 +1888,8 @@ class tqdm(Comparable):
         Returns
         -------
         out  : bool or None
-            True if a `display()` was triggered.
+            True if a `display()` was triggered
+            (never for `sharded` bars, which return None).
         """
         if self.disable:
             return
@@ -1240,12 +1903,16 @@ class tqdm(Comparable):
             cur_t = self._time()
             dt = cur_t - self.last_print_t
             if dt >= self.mininterval and cur_t >= self.start_t + self.delay:
-                cur_t = self._time()
                 dn = self.n - self.last_print_n  # >= n
+                self._thread_id = get_ident()
                 if self.smoothing and dt and dn:
                     # EMA (not just overall average)
                     self._ema_dn(dn)
                     self._ema_dt(dt)
+                if self.histogram is not None and dn > 0:
+                    self.histogram.add(dt / dn, dn)
+                if self.estimator is not None:
+                    self.estimator.add(self.n, cur_t)
                 self.refresh(lock_args=self.lock_args)
                 if self.dynamic_miniters:
                     # If no `miniters` was specified, adjust automatically to the
@@ -1253,7 +1920,9 @@ class tqdm(Comparable):
                     # e.g.: After running `tqdm.update(5)`, subsequent
                     # calls to `tqdm.update()` will only cause an update after
                     # at least 5 more iterations.
-                    if self.maxinterval and dt >= self.maxinterval:
+                    if self.predictive_miniters and self.mininterval:
+                        self.miniters = self._predict_miniters(dn, dt)
+                    elif self.maxinterval and dt >= self.maxinterval:
                         self.miniters = dn * (self.mininterval or self.maxinterval) / dt
                     elif self.smoothing:
                         # EMA miniters update
@@ -1268,15 +1937,36 @@ class tqdm(Comparable):
                 self.last_print_n = self.n
                 self.last_print_t = cur_t
                 return True
+            if self.predictive_miniters and self.dynamic_miniters and dt < self.mininterval:
+                # too early: reschedule
+                self.miniters = self._predict_miniters(self.n - self.last_print_n, dt)
+
+    def _predict_miniters(self, dn, dt):
+        """
+        Returns the number of iterations since the last display expected to
+        reach `mininterval`, given `dn` iterations in the past `dt` seconds.
+        """
+        if dn <= 0:  # no information: keep the current prediction
+            return self.miniters or 1
+        if dt <= 0:  # e.g. coarse `clock`
+            return 2 * dn
+        # aim 5% late to avoid checking again just before the deadline
+        return dn * self.mininterval / dt * 1.05
 
     def close(self):
         """Cleanup and (if leave=False) close the progress bar."""
         if getattr(self, 'disable', True):
             return
 
+        self._fold_shards()
         # Prevent multiple closures
         self.disable = True
 
+        ticker = getattr(self, '_ticker', None)
+        if ticker is not None:  # let the `clock="coarse"` thread exit once unused
+            with self._lock:
+                ticker.bars -= 1
+
         # decrement instance pos and remove from internal set
         pos = abs(self.pos)
         self._decr_instances(self)
@@ -1305,9 +1995,20 @@ class tqdm(Comparable):
         leave = pos == 0 if self.leave is None else self.leave
 
         with self._lock:
-            if leave:
+            if self.jsonl:
+                self._ema_dt = lambda: None
+                self.estimator = None
+                if self._overhead is None:
+                    self._write_jsonl(closed=True)
+                else:  # rather than a (non-JSON) "tqdm overhead" line
+                    overhead = self._overhead
+                    self._write_jsonl(closed=True, stats={
+                        name: {'time': t, 'calls': overhead.calls[name]}
+                        for name, t in overhead.time.items()})
+            elif leave:
                 # stats for overall rate (no weighted average)
                 self._ema_dt = lambda: None
+                self.estimator = None
                 self.display(pos=0)
                 fp_write('\n')
             else:
@@ -1315,9 +2016,13 @@ class tqdm(Comparable):
                 if self.display(msg='', pos=pos) and not pos:
                     fp_write('\r')
 
+        if self._overhead is not None and not self.jsonl:
+            self.write(f"{self.desc + ': ' if self.desc else ''}tqdm overhead: {self._overhead}",
+                       file=self.fp)
+
     def clear(self, nolock=False):
         """Clear current bar display."""
-        if self.disable:
+        if self.disable or self.jsonl:
             return
 
         if not nolock:
@@ -1353,11 +2058,32 @@ class tqdm(Comparable):
                     return False
             else:
                 self._lock.acquire()
+        start_t = perf_counter()
         self.display()
+        self._add_render_time(perf_counter() - start_t)
         if not nolock:
             self._lock.release()
         return True
 
+    def _add_render_time(self, dt):
+        """
+        Accounts for `dt` seconds spent displaying, widening the refresh
+        intervals as needed to respect `render_budget`.
+        """
+        self.render_t += dt
+        if self.render_budget:
+            mininterval, maxinterval = self._intervals
+            # respect changes (e.g. `t.mininterval = ...`) since last widened
+            if self.mininterval != self._widened[0]:
+                mininterval = self.mininterval
+            if self.maxinterval != self._widened[1]:
+                maxinterval = self.maxinterval
+            self._intervals = mininterval, maxinterval
+            self.mininterval = max(mininterval, self._ema_render(dt) / self.render_budget)
+            if maxinterval:
+                self.maxinterval = max(maxinterval, self.mininterval)
+            self._widened = self.mininterval, self.maxinterval
+
     def unpause(self):
         """Restart tqdm timer from last print time."""
         if self.disable:
@@ -1376,6 +2102,7 @@ class tqdm(Comparable):
         ----------
         total  : int or float, optional. Total to use for the new bar.
         """
+        self._fold_shards()  # discard
         self.n = 0
         if total is not None:
             self.total = total
@@ -1386,6 +2113,11 @@ class tqdm(Comparable):
         self._ema_dn = EMA(self.smoothing)
         self._ema_dt = EMA(self.smoothing)
         self._ema_miniters = EMA(self.smoothing)
+        if self.histogram is not None:
+            self.histogram = Histogram()
+        if self.estimator is not None:
+            self.estimator.reset()
+            self.estimator.add(0, self.start_t)
         self.refresh()
 
     def set_description(self, desc=None, refresh=True):
@@ -1452,23 +2184,56 @@ class tqdm(Comparable):
         self.fp.write('\n' * n + _term_move_up() * -n)
         getattr(self.fp, 'flush', lambda: None)()
 
+    def _write_jsonl(self, **extra):
+        """Writes a JSON line record of `format_dict` (plus `extra`)."""
+        from json import dumps  # slow import
+        d = self.format_dict
+        n, total, elapsed, rate = d['n'], d['total'], d['elapsed'], d['rate']
+        if rate is None and elapsed:
+            rate = (n - d['initial']) / elapsed
+        remaining = (total - n) / rate if rate and total else None
+
+        def num(x):
+            # JSON has no NaN/Infinity (use null), nor e.g. `numpy.int64`
+            x = getattr(x, 'item', lambda: x)()
+            return x if x is not None and isfinite(x) else None
+
+        self.fp.write(dumps({
+            'desc': self.desc, 'n': num(n), 'total': num(total), 'unit': self.unit,
+            'elapsed': num(elapsed), 'rate': num(rate), 'remaining': num(remaining),
+            'postfix': self.postfix or None, **extra}, default=float, allow_nan=False) + '\n')
+        getattr(self.fp, 'flush', lambda: None)()
+
+    def _fold_shards(self):
+        """Adds `sharded` counts to `n` (holding the lock, as folds may race)."""
+        if getattr(self, '_counter', None) is not None:
+            with self._lock:
+                self.n += self._counter.pop()
+
     @property
     def format_dict(self):
         """Public API for read-only member access."""
         if self.disable and not hasattr(self, 'unit'):
             return defaultdict(lambda: None, {
                 'n': self.n, 'total': self.total, 'elapsed': 0, 'unit': 'it'})
+        self._fold_shards()
         if self.dynamic_ncols:
             self.ncols, self.nrows = self.dynamic_ncols(self.fp)
-        return {
+        res = {
             'n': self.n, 'total': self.total,
             'elapsed': self._time() - self.start_t if hasattr(self, 'start_t') else 0,
             'ncols': self.ncols, 'nrows': self.nrows, 'prefix': self.desc,
             'ascii': self.ascii, 'unit': self.unit, 'unit_scale': self.unit_scale,
-            'rate': self._ema_dn() / self._ema_dt() if self._ema_dt() else None,
+            'rate': (self.estimator.rate(self.n, self.total) if self.estimator is not None
+                     else self._ema_dn() / self._ema_dt() if self._ema_dt() else None),
             'bar_format': self.bar_format, 'postfix': self.postfix,
             'unit_divisor': self.unit_divisor, 'initial': self.initial,
             'colour': self.colour}
+        if self._overhead is not None:
+            res['stats'] = dict(self._overhead.time)
+        if self.histogram is not None:
+            res['p50'], res['p95'], res['p99'] = self.histogram.percentiles(50, 95, 99)
+        return res
 
     def display(self, msg=None, pos=None):
         """
@@ -1483,6 +2248,16 @@ class tqdm(Comparable):
         pos  : int, optional. Position to `moveto`
           (default: `abs(self.pos)`).
         """
+        if self.jsonl:
+            if msg is not None:  # e.g. clearing
+                return False
+            cur_t = self._time()
+            if self._jsonl_t is not None and cur_t - self._jsonl_t < self.jsonl:
+                return False
+            self._jsonl_t = cur_t
+            self._write_jsonl()
+            return True
+
         if pos is None:
             pos = abs(self.pos)
 
@@ -1499,11 +2274,17 @@ class tqdm(Comparable):
                 " instead of `tqdm(..., gui=True)`\n",
                 fp_write=getattr(self.fp, 'write', sys.stderr.write))
 
-        if pos:
-            self.moveto(pos)
-        self.sp(self.__str__() if msg is None else msg)
-        if pos:
-            self.moveto(-pos)
+        msg = self.__str__() if msg is None else msg
+        format_status = getattr(self.sp, 'format_status', None)
+        if format_status is None:  # custom `status_printer`
+            if pos:
+                self.moveto(pos)
+            self.sp(msg)
+            if pos:
+                self.moveto(-pos)
+        else:  # single write
+            self.fp.write('\n' * pos + format_status(msg) + _term_move_up() * pos)
+            getattr(self.fp, 'flush', lambda: None)()
         return True
 
     @classmethod
@@ -4,8 +4,9 @@ General helpers required for `tqdm.std`.
 import os
 import re
 import sys
-from functools import partial, partialmethod, wraps
-from inspect import signature
+from _string import formatter_field_name_split
+from functools import lru_cache, partial, partialmethod, wraps
+from string import Formatter
 # TODO consider using wcswidth third-party package for 0-width characters
 from unicodedata import east_asian_width
 from warnings import warn
@@ -51,6 +52,9 @@ def envwrap(name, app="", types=None, is_method=False):
     part = partialmethod if is_method else partial
 
     def wrap(func):
+        if not env_overrides:
+            return part(func)
+        from inspect import signature  # slow import
         params = signature(func).parameters
         # ignore unknown env vars
         overrides = {k: v for k, v in env_overrides.items() if k in params}
@@ -97,6 +101,70 @@ class FormatReplace:
         return self.replace
 
 
+class FormatTemplate:
+    """
+    `str.format` template parsed once into literal segments and field getters.
+
+    >>> t = FormatTemplate('{n}/{total:>3}')
+    >>> sorted(t.fields)
+    ['n', 'total']
+    >>> ''.join(t.render({'n': 1, 'total': 2}))
+    '1/  2'
+    """  # NOQA: P102
+    CONVERSIONS = {'r': repr, 's': str, 'a': ascii}
+
+    def __init__(self, template):
+        self.template = template
+        self.fields = set()  # names of (top-level) fields referenced
+        self.segments = []  # [(literal, name, accessors, conversion, spec)]
+        for literal, field, spec, conversion in Formatter().parse(template):
+            if field is None:
+                self.segments.append((literal, None, (), None, ''))
+                continue
+            name, accessors = formatter_field_name_split(field)
+            if isinstance(name, int) or not name:
+                raise IndexError(f"Replacement index {name or 0} out of range"
+                                 " for positional args tuple")
+            if conversion and conversion not in self.CONVERSIONS:
+                raise ValueError(f"Unknown conversion specifier {conversion}")
+            if spec and '{' in spec:  # nested fields, e.g. `{bar:{ncols}}`
+                spec = self.compile(spec)
+                self.fields.update(spec.fields)
+            self.fields.add(name)
+            self.segments.append((literal, name, tuple(accessors), conversion, spec))
+
+    @staticmethod
+    @lru_cache(maxsize=128)
+    def compile(template):
+        """Cached constructor."""
+        return FormatTemplate(template)
+
+    def render(self, kwargs, defer=()):
+        """
+        Returns a list of formatted strings (join to obtain
+        `self.template.format(**kwargs)`), leaving `(name, spec)` tuples
+        in place of any fields in `defer` (for formatting separately).
+        """
+        res = []
+        for literal, name, accessors, conversion, spec in self.segments:
+            if literal:
+                res.append(literal)
+            if name is None:
+                continue
+            if not isinstance(spec, str):
+                spec = ''.join(spec.render(kwargs))
+            if name in defer and not (accessors or conversion):
+                res.append((name, spec))
+                continue
+            obj = kwargs[name]
+            for is_attr, key in accessors:
+                obj = getattr(obj, key) if is_attr else obj[key]
+            if conversion:
+                obj = self.CONVERSIONS[conversion](obj)
+            res.append(format(obj, spec))
+        return res
+
+
 class Comparable:
     """Assumes child has self._comparable attr/@property"""
     def __lt__(self, other):
@@ -309,7 +377,8 @@ def disp_len(data):
     Returns the real on-screen length of a string which may contain
     ANSI control codes and wide chars.
     """
-    return _text_width(RE_ANSI.sub('', data))
+    data = RE_ANSI.sub('', data)
+    return len(data) if data.isascii() else _text_width(data)
 
 
 def disp_trim(data, length):